@@ -0,0 +1,141 @@
+"""Benchmarks of the standings hot paths on synthetic leagues.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_standings                      # print timings
+    python -m benchmarks.bench_standings --save baseline.json  # record a baseline
+    python -m benchmarks.bench_standings --compare baseline.json
+
+Every case is timed `--repeat` times (median and best wall time are kept) and
+then run once more under tracemalloc for its peak allocation. With --compare,
+a case whose median time or peak memory grew more than --threshold over the
+baseline is flagged and the exit status is 1.
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from standings import core
+from standings.export import write_exports
+from standings.parse import parse_items, to_dataframe
+from standings.season import Season
+from standings.simulate import simulate_positions
+from standings.synthetic import synthetic_payload, synthetic_scenarios
+from standings.whatif import rank_scenarios
+
+# name -> synthetic_payload arguments; 1000 teams are laid out as 50 groups of 20
+SIZES = {
+    "18": dict(n_teams=18, played=0.8, forfeits=1),
+    "100": dict(n_teams=100, played=0.8, forfeits=2),
+    "1000": dict(n_teams=1000, groups=50, played=0.8, forfeits=5),
+}
+N_SCENARIOS = 10_000
+
+
+def largest_tie(table):
+    """Teams of the largest group tied on wins (at least two teams)."""
+    sizes = table.groupby("W")["Team"].transform("size")
+    tied = table[sizes == sizes.max()]
+    return list(tied["Team"] if len(tied) > 1 else table["Team"].head(2))
+
+
+def cases(sizes, n_scenarios):
+    """(name, function) of every benchmark case; the setup work is done here, outside the timings."""
+    out_dir = tempfile.mkdtemp(prefix="standings-bench-")
+    for size in sizes:
+        body = json.dumps(synthetic_payload(**SIZES[size])).encode("utf-8")
+        df, sanctioned = core.parse_payload(body, detect_sanctioned=True)
+        table = core.resolve_tiebreakers_with_bylaws(df, sanctioned)
+        tied = largest_tie(table)
+        jobs = [(f"bench_{size}.txt", "A", table)]
+
+        yield f"parse_games[{size}]", lambda body=body: core.parse_games(json.loads(body)["data"], True)
+        yield f"parse_payload[{size}]", lambda body=body: core.parse_payload(io.BytesIO(body), True)
+        yield f"compute_standings[{size}]", lambda df=df, s=sanctioned: core.compute_standings_with_bylaws(df, s)
+        yield f"head_to_head[{size}]", lambda df=df, tied=tied: core.head_to_head_bylaws(df, tied)
+        yield f"resolve_tiebreakers[{size}]", lambda df=df, s=sanctioned: core.resolve_tiebreakers_with_bylaws(df, s)
+        yield f"write_exports[{size}]", lambda jobs=jobs: write_exports(jobs, out_dir, ("txt", "csv", "json"))
+
+    parsed = parse_items(synthetic_payload(**SIZES["18"])["data"], detect_sanctioned=True)
+    df, sanctioned, season = to_dataframe(parsed), parsed["sanctioned"], Season.from_parsed(parsed)
+    scenarios = synthetic_scenarios(season, n_scenarios)
+    yield f"rank_scenarios[{n_scenarios}]", lambda: rank_scenarios(season, scenarios)
+    yield f"simulate_positions[{n_scenarios}]", lambda: simulate_positions(
+        df, n_sims=n_scenarios, sanctioned_teams=sanctioned, seed=0, processes=1)
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"median_s": statistics.median(times), "best_s": min(times), "peak_bytes": peak}
+
+
+def regressions(results, baseline, threshold):
+    """(case, metric, baseline value, new value) of every metric over baseline * (1 + threshold)."""
+    flagged = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("median_s", "peak_bytes"):
+            if result[metric] > base[metric] * (1 + threshold):
+                flagged.append((name, metric, base[metric], result[metric]))
+    return flagged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated league sizes (default: all)")
+    parser.add_argument("--scenarios", type=int, default=N_SCENARIOS, help="what-if / Monte Carlo scenarios")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (default: 5)")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="flag regressions against this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed growth over the baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<32} {'median ms':>10} {'best ms':>10} {'peak MiB':>10}")
+    for name, func in cases(args.sizes.split(","), args.scenarios):
+        if args.filter not in name:
+            continue
+        result = results[name] = measure(func, args.repeat)
+        print(f"{name:<32} {result['median_s'] * 1e3:>10.2f} {result['best_s'] * 1e3:>10.2f} "
+              f"{result['peak_bytes'] / 2 ** 20:>10.2f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__,
+                       "machine": platform.machine(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        flagged = regressions(results, baseline, args.threshold)
+        for name, metric, old, new in flagged:
+            print(f"REGRESSION {name} {metric}: {old:.6g} -> {new:.6g} ({new / old - 1:+.0%})")
+        if flagged:
+            return 1
+        print(f"No regressions over {args.compare} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
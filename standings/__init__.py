@@ -0,0 +1,4 @@
+"""Shared standings engine for the EuroLeague and EuroCup scripts.
+
+Submodules are imported on demand so that importing the package stays cheap.
+"""
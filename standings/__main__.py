@@ -0,0 +1,5 @@
+import sys
+
+from standings.cli import main
+
+sys.exit(main())
@@ -0,0 +1,71 @@
+"""Parallel recompute of every stored competition, season and group.
+
+Every (competition, season, group) table becomes one job, with the groups read
+from each season through export_groups, so old EuroCup formats with four or
+more groups and Top 16 phases are covered as well as the current A/B split.
+Workers receive the group's compact Season (small integer columns and a team
+dictionary, never a DataFrame) and send back only the ranking order; the
+parent builds the tables and writes the exports, one directory per
+competition and season.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from standings.core import COMPETITIONS, export_groups
+from standings.export import write_exports
+
+
+def _rank(season):
+    return season.ranking().astype(np.int16)
+
+
+def rank_all(seasons, processes=None):
+    """
+    Rank many seasons on a process pool.
+
+    Args:
+        seasons (list): Season objects, pickled as their compact columns
+        processes (int): worker processes; 1 runs in the current process, None uses every core
+    Returns:
+        list: ranking order of every season, in the same order
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1 or len(seasons) <= 1:
+        return [_rank(season) for season in seasons]
+    chunksize = max(1, len(seasons) // (4 * processes))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_rank, seasons, chunksize=chunksize))
+
+
+def recompute_all(store, out_dir, pairs=None, processes=None, formats=("txt",)):
+    """
+    Recompute and export the standings of every group of every stored season.
+
+    Args:
+        store (GameStore): where the seasons are read from (memory-mapped)
+        out_dir (str): exports go to out_dir/<competition code>/<season>/
+        pairs (iterable): (competition code, season) tuples, every stored partition if None
+        processes (int): worker processes, see rank_all
+        formats (iterable): export formats, see write_exports
+    Returns:
+        list: Path of every file written
+    """
+    jobs = []
+    for code, year in (store.partitions() if pairs is None else pairs):
+        competition = COMPETITIONS[code].for_season(year)
+        for filename, label, season in export_groups(competition, store.load(code, year)):
+            jobs.append((Path(out_dir) / code / str(year), filename, label, season))
+
+    orders = rank_all([season for _, _, _, season in jobs], processes)
+
+    exports = {}
+    for (directory, filename, label, season), order in zip(jobs, orders):
+        exports.setdefault(directory, []).append((filename, label, season.table(order)))
+    paths = []
+    for directory, tables in exports.items():
+        paths += write_exports(tables, directory, formats)
+    return paths
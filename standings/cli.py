@@ -0,0 +1,221 @@
+"""Command line entry point: python -m standings el|ec|watch|recompute|history|timeline|serve [--season YEAR] [--out DIR].
+
+Only the standard library is imported at module level; pandas, NumPy and
+requests are pulled in by standings.core when a command actually runs, so
+--help stays instant and other tools can import this module cheaply.
+"""
+import argparse
+
+
+def _store(args):
+    if args.store is None and not args.offline:
+        return None
+    from standings.store import DEFAULT_ROOT, GameStore
+
+    return GameStore(args.store or DEFAULT_ROOT)
+
+
+def _formats(args):
+    return tuple(args.format or ["txt"])
+
+
+def _cmd_el(args):
+    from standings import core
+
+    core.run_euroleague_standings(core.EUROLEAGUE.for_season(args.season), out_dir=args.out,
+                                  store=_store(args), offline=args.offline, formats=_formats(args))
+
+
+def _cmd_ec(args):
+    from standings import core
+
+    core.run_eurocup_group_standings(core.EUROCUP.for_season(args.season), out_dir=args.out,
+                                     store=_store(args), offline=args.offline, formats=_formats(args))
+
+
+def _cmd_watch(args):
+    import logging
+
+    from standings import core
+    from standings.watch import Watcher
+
+    competitions = [core.COMPETITIONS[code].for_season(args.season) for code in args.competition or ["E", "U"]]
+    if args.api_url:
+        competitions = [competition.with_api_url(args.api_url) for competition in competitions]
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    watcher = Watcher(competitions, out_dir=args.out, formats=_formats(args), fast=args.fast, slow=args.slow)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def _cmd_recompute(args):
+    from standings.batch import recompute_all
+
+    paths = recompute_all(_store(args), args.out or ".", processes=args.processes, formats=_formats(args))
+    print(f"{len(paths)} archivos guardados en: {args.out or '.'}")
+
+
+def _cmd_history(args):
+    from pathlib import Path
+
+    from standings.history import History
+
+    store = _store(args)
+    cache = Path(args.cache) if args.cache else store.root / "history"
+    history = History.load(cache) if History.saved(cache) else History()
+    if history.update(store, processes=args.processes):
+        history.save(cache)
+
+    if args.wins_for_rank is not None:
+        print(history.wins_for_rank(args.wins_for_rank, args.code))
+    if args.missed_top is not None:
+        wins, losses = (int(x) for x in args.missed_top[0].split("-"))
+        rows = history.missed_top(wins, losses, int(args.missed_top[1]), args.code)
+        print(rows[["Code", "Season", "Group", "Rank", "Team", "W", "L", "TieSize", "TieMethod"]].to_string(index=False))
+    if args.ties is not None:
+        ties = history.tie_usage(args.ties, args.method, args.code)
+        print(f"{len(ties)} empates de {args.ties} equipos")
+        print(ties.to_string(index=False))
+
+
+def _cmd_timeline(args):
+    from pathlib import Path
+
+    from standings import core
+    from standings.timeline import season_timeline, write_timeline
+
+    competition = core.COMPETITIONS[args.competition].for_season(args.season)
+    season = core.current_season(competition, _store(args), args.offline)
+    out_dir = Path(args.out or ".")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for filename, _, group_season in core.export_groups(competition, season):
+        path = out_dir / f"{Path(filename).stem}_timeline.{args.timeline_format}"
+        write_timeline(season_timeline(group_season), path, args.timeline_format)
+        print(f"Guardado en: {path}")
+
+
+def _cmd_serve(args):
+    import logging
+
+    from standings import core
+    from standings.service import StandingsService, make_server
+
+    competitions = [core.COMPETITIONS[code].for_season(args.season) for code in args.competition or ["E", "U"]]
+    if args.api_url:
+        competitions = [competition.with_api_url(args.api_url) for competition in competitions]
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    service = StandingsService(competitions, interval=args.interval).start()
+    server = make_server(service, args.host, args.port)
+    print(f"Sirviendo en: http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+def _instrument_arguments(cmd):
+    cmd.add_argument("--instrument", metavar="PATH", default=None,
+                     help="write per-stage timings to PATH (.prom for Prometheus text, JSON otherwise)")
+    cmd.add_argument("--trace-memory", action="store_true", help="record allocation peaks with tracemalloc")
+    cmd.add_argument("--profile", metavar="DIR", default=None,
+                     help="dump a cProfile run and the top tracemalloc allocations into DIR")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="standings", description="EuroLeague and EuroCup standings exports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, func, help_text in (
+        ("el", _cmd_el, "EuroLeague standings (.txt export)"),
+        ("ec", _cmd_ec, "EuroCup group standings (one .txt per group)"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--season", type=int, default=2025, help="season start year (default: 2025)")
+        cmd.add_argument("--out", default=None, help="output directory (default: current directory)")
+        cmd.add_argument("--store", default=None, help="game store directory to upsert fetched games into")
+        cmd.add_argument("--offline", action="store_true", help="rank from the game store without calling the API")
+        cmd.add_argument("--format", action="append", choices=("txt", "csv", "json", "parquet"),
+                         help="export format, repeatable (default: txt)")
+        _instrument_arguments(cmd)
+        cmd.set_defaults(func=func)
+
+    watch = sub.add_parser("watch", help="keep the exports up to date while results come in")
+    watch.add_argument("--competition", action="append", choices=("E", "U"),
+                       help="competition code to watch, repeatable (default: E and U)")
+    watch.add_argument("--season", type=int, default=2025, help="season start year (default: 2025)")
+    watch.add_argument("--out", default=None, help="output directory (default: current directory)")
+    watch.add_argument("--format", action="append", choices=("txt", "csv", "json", "parquet"),
+                       help="export format, repeatable (default: txt)")
+    watch.add_argument("--fast", type=float, default=5, help="seconds between polls while results change (default: 5)")
+    watch.add_argument("--slow", type=float, default=300, help="longest wait between quiet polls (default: 300)")
+    watch.add_argument("--api-url", default=None, help="games endpoint template, e.g. a local replay of the API")
+    _instrument_arguments(watch)
+    watch.set_defaults(func=_cmd_watch)
+
+    recompute = sub.add_parser("recompute", help="every group of every stored season, on a process pool")
+    recompute.add_argument("--store", default=None, help="game store directory (default: the standard one)")
+    recompute.add_argument("--out", default=None, help="output root, one <code>/<season> folder each (default: .)")
+    recompute.add_argument("--processes", type=int, default=None, help="worker processes (default: every core)")
+    recompute.add_argument("--format", action="append", choices=("txt", "csv", "json", "parquet"),
+                           help="export format, repeatable (default: txt)")
+    recompute.set_defaults(func=_cmd_recompute, offline=True)
+    _instrument_arguments(recompute)
+
+    history = sub.add_parser("history", help="queries over the standings of every stored season")
+    history.add_argument("--store", default=None, help="game store directory (default: the standard one)")
+    history.add_argument("--cache", default=None, help="summary tables directory (default: <store>/history)")
+    history.add_argument("--processes", type=int, default=None, help="worker processes for seasons to re-rank")
+    history.add_argument("--code", choices=("E", "U"), default=None, help="only one competition")
+    history.add_argument("--wins-for-rank", type=int, metavar="RANK", help="wins of the team finishing at RANK")
+    history.add_argument("--missed-top", nargs=2, metavar=("W-L", "TOP"), help="teams with a W-L record below TOP")
+    history.add_argument("--ties", type=int, metavar="SIZE", help="ties on wins of SIZE teams")
+    history.add_argument("--method", choices=("h2h", "fallback", "h2h+fallback"), default=None, help="how the ties were resolved")
+    history.set_defaults(func=_cmd_history, offline=True)
+    _instrument_arguments(history)
+
+    timeline = sub.add_parser("timeline", help="rank of every team after every round (one file per group)")
+    timeline.add_argument("--competition", choices=("E", "U"), default="E", help="competition code (default: E)")
+    timeline.add_argument("--season", type=int, default=2025, help="season start year (default: 2025)")
+    timeline.add_argument("--out", default=None, help="output directory (default: current directory)")
+    timeline.add_argument("--store", default=None, help="game store directory to upsert fetched games into")
+    timeline.add_argument("--offline", action="store_true", help="rank from the game store without calling the API")
+    timeline.add_argument("--timeline-format", choices=("csv", "json"), default="csv", help="default: csv")
+    timeline.set_defaults(func=_cmd_timeline)
+    _instrument_arguments(timeline)
+
+    serve = sub.add_parser("serve", help="HTTP service with the current standings, timelines and what-ifs")
+    serve.add_argument("--competition", action="append", choices=("E", "U"),
+                       help="competition code to serve, repeatable (default: E and U)")
+    serve.add_argument("--season", type=int, default=2025, help="season start year (default: 2025)")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    serve.add_argument("--interval", type=float, default=30, help="seconds between API polls (default: 30)")
+    serve.add_argument("--api-url", default=None, help="games endpoint template, e.g. a local replay of the API")
+    serve.set_defaults(func=_cmd_serve)
+    _instrument_arguments(serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not (args.instrument or args.profile):
+        args.func(args)
+        return 0
+
+    from standings import instrument
+
+    instrument.enable(profile=bool(args.profile), trace_memory=args.trace_memory or bool(args.profile))
+    try:
+        args.func(args)
+    finally:
+        if args.instrument:
+            instrument.write_report(args.instrument)
+        if args.profile:
+            instrument.dump(args.profile)
+        instrument.disable()
+    return 0
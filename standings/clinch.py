@@ -0,0 +1,227 @@
+"""Clinch and elimination checks over the remaining schedule.
+
+A team has clinched a top-N place when it finishes inside the top N in every
+possible outcome of the unplayed games, and is eliminated when it finishes
+inside in none of them. Outcomes are searched depth first with bounds on the
+reachable win totals, games that cannot affect the team are dropped, and
+sub-scenarios already proven fruitless are cached. The cache key is the part
+of the state the rest of the search depends on: the wins of the teams that can
+still finish level with the team, their head-to-head wins, and for every other
+team only whether it stays above or below, so different paths to the same
+state share one entry.
+
+Only winners are enumerated: margins of unplayed games are unknown, so a tie
+that would be decided by points is counted against the team when checking a
+clinch and in its favour when checking elimination. Answers are therefore
+never optimistic.
+"""
+import numpy as np
+import pandas as pd
+
+from standings.state import StandingsState
+from standings.tiebreak import resolve_group
+
+
+class _Context:
+    """Static data of one query, as plain Python lists for the search loop."""
+
+    def __init__(self, state, remaining):
+        n = len(state.teams)
+        self.n = n
+        self.sanctioned = state.sanctioned.tolist()
+        self.name_rank = state.name_rank.tolist()
+        self.h2h_games = state.h2h_games.tolist()
+        self.h2h_arrays = (state.h2h_points, state.h2h_games)
+        self.losses = state.losses.tolist()
+        self.pf = state.pf.tolist()
+        self.pa = state.pa.tolist()
+        self.remaining = remaining
+        self.left = [0] * n
+        self.pair_left = [[0] * n for _ in range(n)]
+        for h, a in remaining:
+            self.left[h] += 1
+            self.left[a] += 1
+            self.pair_left[h][a] += 1
+            self.pair_left[a][h] += 1
+        self.scheduled = [int(w + l) + r for w, l, r in zip(state.wins, state.losses, self.left)]
+
+
+def _position_bound(team, wins, h2h_wins, ctx, worst):
+    """Worst (or best) final position of team once every winner is known."""
+    above = sum(1 for w in wins if w > wins[team])
+    group = [t for t in range(ctx.n) if wins[t] == wins[team]]
+    if len(group) == 1:
+        return above + 1
+
+    # Head-to-head wins are known for every outcome, so restart on the level subset until it stops shrinking
+    if all(ctx.h2h_games[a][b] >= 2 for a in group for b in group if a != b):
+        while len(group) > 1:
+            mini = {t: sum(h2h_wins[t][o] for o in group) for t in group}
+            above += sum(1 for t in group if mini[t] > mini[team])
+            level = [t for t in group if mini[t] == mini[team]]
+            if len(level) == len(group):
+                break
+            group = level
+        if len(group) == 1:
+            return above + 1
+        if any(ctx.pair_left[a][b] for a in group for b in group):
+            # Points among the group still depend on unplayed margins
+            return above + (len(group) if worst else 1)
+
+    uncertain = []
+
+    def fallback(sub):
+        if any(ctx.left[t] for t in sub):
+            uncertain.append(set(sub.tolist()))
+        return sub[np.lexsort(tuple(np.array([_general_key(t, ctx)[k] for t in sub]) for k in range(4, -1, -1)))]
+
+    order = resolve_group(np.array(group), np.array(h2h_wins), *ctx.h2h_arrays, fallback).tolist()
+    place = order.index(team)
+    above += place
+    for sub in uncertain:
+        if team in sub:
+            if worst:
+                above += sum(1 for t in order[place + 1:] if t in sub)
+            else:
+                above -= sum(1 for t in order[:place] if t in sub)
+    return above + 1
+
+
+def _general_key(team, ctx):
+    return (ctx.sanctioned[team], -ctx.scheduled[team], -(ctx.pf[team] - ctx.pa[team]), -ctx.pf[team], ctx.name_rank[team])
+
+
+def _find_outcome(ctx, wins, h2h_wins, team, top_n, inside):
+    """
+    Search for an outcome where team finishes inside (best case) or outside (worst case) the top N.
+
+    Returns the list of winners of ctx.remaining, or None if no such outcome exists.
+    """
+    n = ctx.n
+    max_wins = [wins[t] + ctx.left[t] for t in range(n)]
+
+    # Teams that can never draw level with the team only matter through their opponents
+    lo, hi = wins[team], max_wins[team]
+    relevant = [t == team or (max_wins[t] >= lo and wins[t] <= hi) for t in range(n)]
+    games = [(k, h, a) for k, (h, a) in enumerate(ctx.remaining) if relevant[h] or relevant[a]]
+    games.sort(key=lambda g: (team not in (g[1], g[2]), -(relevant[g[1]] and relevant[g[2]])))
+
+    wins = list(wins)
+    h2h_wins = [list(row) for row in h2h_wins]
+    left = list(ctx.left)
+    winners = [None] * len(ctx.remaining)
+    members = [t for t in range(n) if relevant[t]]
+    failed = set()
+
+    def state_key(depth):
+        # The rest of the search depends on the wins of the teams that can still
+        # finish level with the team and on their head-to-head wins (the games
+        # left are fixed by depth). Any other team stays above or below it
+        # whatever happens, so only that side is kept.
+        own_min, own_max = wins[team], wins[team] + left[team]
+        level, sides = [], []
+        for t in members:
+            if wins[t] > own_max:
+                sides.append(-1)
+            elif wins[t] + left[t] < own_min:
+                sides.append(-2)
+            else:
+                level.append(t)
+                sides.append(wins[t])
+        return (depth, tuple(sides), tuple(h2h_wins[x][y] for x in level for y in level if x != y))
+
+    def bounded():
+        own_min, own_max = wins[team], wins[team] + left[team]
+        if inside:
+            certain_above = sum(1 for t in range(n) if t != team and wins[t] > own_max)
+            return certain_above < top_n
+        possible_above = sum(1 for t in range(n) if t != team and wins[t] + left[t] >= own_min)
+        return possible_above >= top_n
+
+    def search(depth):
+        if not bounded():
+            return False
+        if depth == len(games):
+            position = _position_bound(team, wins, h2h_wins, ctx, worst=not inside)
+            return position <= top_n if inside else position > top_n
+
+        key = state_key(depth)
+        if key in failed:
+            return False
+
+        k, h, a = games[depth]
+        if team in (h, a):
+            preferred = team if inside else (a if h == team else h)
+            choices = (preferred, a if preferred == h else h)
+        else:
+            # Opponents of the team's interest: in the worst case push the stronger side up
+            stronger = h if wins[h] >= wins[a] else a
+            weaker = a if stronger == h else h
+            choices = (weaker, stronger) if inside else (stronger, weaker)
+
+        for winner in choices:
+            loser = a if winner == h else h
+            wins[winner] += 1
+            left[h] -= 1
+            left[a] -= 1
+            h2h_wins[winner][loser] += 1
+            winners[k] = winner
+            found = search(depth + 1)
+            wins[winner] -= 1
+            left[h] += 1
+            left[a] += 1
+            h2h_wins[winner][loser] -= 1
+            if found:
+                return True
+        failed.add(key)
+        return False
+
+    if not search(0):
+        return None
+    # Games that cannot affect the team get an arbitrary winner
+    return [w if w is not None else ctx.remaining[k][0] for k, w in enumerate(winners)]
+
+
+def _prepare(df, sanctioned_teams):
+    state = StandingsState.from_calendar(df, sanctioned_teams)
+    remaining = df[df["HomeWin"].isna()]
+    remaining = remaining[remaining["Local"].isin(state.index) & remaining["Visitor"].isin(state.index)]
+    pairs = list(zip(remaining["Local"].map(state.index), remaining["Visitor"].map(state.index)))
+    return state, _Context(state, pairs)
+
+
+def has_clinched(df, team, top_n, sanctioned_teams=None):
+    """True if team finishes inside the top N whatever happens in the remaining games."""
+    state, ctx = _prepare(df, sanctioned_teams)
+    outcome = _find_outcome(ctx, state.wins.tolist(), state.h2h_wins.tolist(), state.index[team], top_n, inside=False)
+    return outcome is None
+
+
+def is_eliminated(df, team, top_n, sanctioned_teams=None):
+    """True if team cannot finish inside the top N whatever happens in the remaining games."""
+    state, ctx = _prepare(df, sanctioned_teams)
+    outcome = _find_outcome(ctx, state.wins.tolist(), state.h2h_wins.tolist(), state.index[team], top_n, inside=True)
+    return outcome is None
+
+
+def clinch_table(df, top_n, sanctioned_teams=None):
+    """
+    Clinched / eliminated flags of every team for a top-N cut.
+
+    Args:
+        df (pd.DataFrame): calendar of one competition or group
+        top_n (int): number of places that qualify (6 play-off, 10 play-in, group spots...)
+        sanctioned_teams (list): team codes ranked last among equals
+    Returns:
+        pd.DataFrame: columns "Team", "Clinched" and "Eliminated"
+    """
+    state, ctx = _prepare(df, sanctioned_teams)
+    wins, h2h_wins = state.wins.tolist(), state.h2h_wins.tolist()
+    rows = []
+    for team, k in state.index.items():
+        rows.append({
+            "Team": team,
+            "Clinched": _find_outcome(ctx, wins, h2h_wins, k, top_n, inside=False) is None,
+            "Eliminated": _find_outcome(ctx, wins, h2h_wins, k, top_n, inside=True) is None,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,319 @@
+"""Fetch, aggregate, tiebreak and export functions shared by every entry point.
+
+standingsEL.py, standingsEC.py and streamlit_standings.py all import from here,
+so each hot function has a single implementation. What differs between the
+EuroLeague and the EuroCup lives in a Competition.
+"""
+import io
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from standings import instrument
+from standings.export import txt_lines, write_exports
+from standings.http_cache import default_cache
+from standings.parse import parse_items, parse_stream, to_dataframe
+from standings.season import Season
+from standings.tiebreak import (
+    head_to_head_applies, head_to_head_matrices, mini_table, name_ranks, rank_teams, resolve_group
+)
+
+API_URL = "https://api-live.euroleague.net/v2/competitions/{code}/seasons/{code}{season}/games"
+
+
+class Competition:
+    """Competition-specific settings: API code, season, groups and export names."""
+
+    def __init__(self, code, season, groups=None, detect_sanctioned=False, filename=None, label="A",
+                 api_url=None):
+        self.code = code
+        self.season = season
+        self.groups = groups
+        self.detect_sanctioned = detect_sanctioned
+        self.filename = filename
+        self.label = label
+        self.api_url = api_url
+
+    @property
+    def key(self):
+        return f"{self.code}{self.season}"
+
+    @property
+    def url(self):
+        return (self.api_url or API_URL).format(code=self.code, season=self.season)
+
+    def for_season(self, season):
+        """Same competition, another season."""
+        return Competition(self.code, season, self.groups, self.detect_sanctioned, self.filename, self.label,
+                           self.api_url)
+
+    def with_api_url(self, api_url):
+        """Same competition served from another endpoint template (e.g. a local replay of the API)."""
+        return Competition(self.code, self.season, self.groups, self.detect_sanctioned, self.filename, self.label,
+                           api_url)
+
+    def group_filename(self, group):
+        return self.filename.format(group=group_slug(group))
+
+
+def group_slug(group):
+    """Group name usable in a file name: "Group C" -> "C", "Top 16 Group E" -> "Top_16_Group_E"."""
+    return re.sub(r"\W+", "_", re.sub(r"^Group\s+", "", str(group))).strip("_")
+
+
+EUROLEAGUE = Competition("E", 2025, detect_sanctioned=True, filename="euroleague_standings_export.txt", label="A")
+EUROCUP = Competition("U", 2025, groups=("A", "B"), detect_sanctioned=True, filename="Group_{group}_Standings_EC.txt")
+COMPETITIONS = {"E": EUROLEAGUE, "U": EUROCUP}
+
+
+# =====================================================
+# ---------------- FETCH / PARSE ----------------------
+# =====================================================
+
+def fetch_body(competition, cache=None):
+    """Raw response body of a competition season, through the on-disk response cache."""
+    return (cache or default_cache()).get(competition.url, competition.key)
+
+
+def fetch_games(competition, cache=None):
+    """Decoded list of games of a competition season."""
+    return json.loads(fetch_body(competition, cache))["data"]
+
+
+def parse_games(response, detect_sanctioned=False):
+    """
+    Build the games DataFrame from the decoded API payload.
+
+    Args:
+        response (list): "data" list of the games endpoint
+        detect_sanctioned (bool): collect teams that lost a game 20-0
+    Returns:
+        tuple: (pd.DataFrame, list of sanctioned team codes)
+    """
+    parsed = parse_items(response, detect_sanctioned, capacity=max(len(response), 1))
+    return to_dataframe(parsed), parsed["sanctioned"]
+
+
+def parse_payload(body, detect_sanctioned=False):
+    """parse_games on a raw response body or binary stream, decoded game by game."""
+    stream = io.BytesIO(body) if isinstance(body, bytes) else body
+    parsed = parse_stream(stream, detect_sanctioned)
+    return to_dataframe(parsed), parsed["sanctioned"]
+
+
+def load_calendar(competition, cache=None):
+    """Fetch and parse a competition season: (games DataFrame, sanctioned team codes)."""
+    path = (cache or default_cache()).fetch(competition.url, competition.key)
+    with path.open("rb") as stream:
+        return parse_payload(stream, competition.detect_sanctioned)
+
+
+def load_season(competition, cache=None):
+    """Fetch and parse a competition season straight into a compact Season."""
+    path = (cache or default_cache()).fetch(competition.url, competition.key)
+    with path.open("rb") as stream:
+        parsed = parse_stream(stream, competition.detect_sanctioned)
+    return Season.from_parsed(parsed, competition.code, competition.season)
+
+
+def split_groups(df, groups):
+    """One games DataFrame per group label, in the order of groups."""
+    return [df[df["Group"] == g].reset_index(drop=True) for g in groups]
+
+
+def actual_calendar():
+    df, sanctioned = load_calendar(EUROLEAGUE)
+    return df.drop(columns="Group"), sanctioned
+
+
+def eurocup_calendar(competition=EUROCUP):
+    """(tuple of one calendar per group, sanctioned team codes), like actual_calendar() for EuroCup."""
+    df, sanctioned = load_calendar(competition)
+    return tuple(split_groups(df, competition.groups)), sanctioned
+
+
+def eurocup_calendar_2025():
+    return eurocup_calendar()[0]
+
+
+# =====================================================
+# ---------------- STANDINGS --------------------------
+# =====================================================
+
+@instrument.stage("compute", rows=lambda standings, args: len(args[0]))
+def compute_standings_with_bylaws(df, sanctioned_teams=None):
+    if sanctioned_teams is None:
+        sanctioned_teams = []
+
+    teams = pd.unique(df[["Local", "Visitor"]].values.ravel())
+    n = len(teams)
+
+    # Only games with a winner count; HomeWin is NaN for unplayed games
+    home_win = df["HomeWin"].to_numpy(dtype=float)
+    played = ~np.isnan(home_win)
+    home_win = home_win[played] == 1
+
+    # Integer team codes so every total is a single bincount
+    index = pd.Index(teams)
+    home = index.get_indexer(df["Local"])[played]
+    away = index.get_indexer(df["Visitor"])[played]
+    hs = df["HomeScore"].to_numpy(dtype=float)[played]
+    rs = df["RoadScore"].to_numpy(dtype=float)[played]
+
+    games = np.bincount(home, minlength=n) + np.bincount(away, minlength=n)
+    wins = np.bincount(home[home_win], minlength=n) + np.bincount(away[~home_win], minlength=n)
+    pf = np.bincount(home, weights=hs, minlength=n) + np.bincount(away, weights=rs, minlength=n)
+    pa = np.bincount(home, weights=rs, minlength=n) + np.bincount(away, weights=hs, minlength=n)
+
+    return {
+        team: {
+            "W": int(wins[k]), "L": int(games[k] - wins[k]),
+            "PF": float(pf[k]), "PA": float(pa[k]), "Games": int(games[k]),
+            "Sanctioned": team in sanctioned_teams
+        }
+        for k, team in enumerate(teams)
+    }
+
+
+def head_to_head_bylaws(df, tied_teams):
+    teams = pd.Index(tied_teams)
+    h2h_wins, h2h_points, h2h_games = head_to_head_matrices(
+        teams.get_indexer(df["Local"]), teams.get_indexer(df["Visitor"]),
+        df["HomeScore"], df["RoadScore"], df["HomeWin"], len(teams))
+
+    group = np.arange(len(teams))
+    if not head_to_head_applies(group, h2h_games):
+        return None
+
+    w, pf, pa = mini_table(group, h2h_wins, h2h_points)
+    df_h2h = pd.DataFrame({"W": w, "PF": pf, "PA": pa}, index=teams)
+    df_h2h["Diff"] = df_h2h["PF"] - df_h2h["PA"]
+    return df_h2h.iloc[resolve_group(group, h2h_wins, h2h_points, h2h_games, lambda g: g)]
+
+
+@instrument.stage("resolve", rows=lambda table, args: len(args[0]))
+def resolve_tiebreakers_with_bylaws(df, sanctioned_teams=None):
+    standings = compute_standings_with_bylaws(df, sanctioned_teams)
+    df_stand = pd.DataFrame.from_dict(standings, orient="index")
+    df_stand["Diff"] = df_stand["PF"] - df_stand["PA"]
+    df_stand["Total"] = df_stand["W"] + df_stand["L"]
+    df_stand = df_stand.reset_index().rename(columns={"index": "Team"})
+
+    # Map acronyms to full club names
+    names = pd.concat([
+        pd.Series(df["Local_Name"].to_numpy(), index=df["Local"].to_numpy()),
+        pd.Series(df["Visitor_Name"].to_numpy(), index=df["Visitor"].to_numpy()),
+    ])
+    names = names[names.index.notna() & ~names.index.duplicated(keep="last")]
+    df_stand["ClubName"] = df_stand["Team"].map(names)
+
+    # One head-to-head matrix per season; tie groups are resolved recursively on slices of it
+    teams = pd.Index(df_stand["Team"])
+    h2h_wins, h2h_points, h2h_games = head_to_head_matrices(
+        teams.get_indexer(df["Local"]), teams.get_indexer(df["Visitor"]),
+        df["HomeScore"], df["RoadScore"], df["HomeWin"], len(teams))
+    order = rank_teams(
+        df_stand["W"].to_numpy(), df_stand["L"].to_numpy(),
+        df_stand["PF"].to_numpy(dtype=float), df_stand["PA"].to_numpy(dtype=float),
+        name_ranks(df_stand["ClubName"]), h2h_wins, h2h_points, h2h_games,
+        df_stand["Sanctioned"].to_numpy(dtype=bool))
+
+    return df_stand.iloc[order].reset_index(drop=True)
+
+
+# =====================================================
+# ---------------- EXPORT -----------------------------
+# =====================================================
+
+def generate_txt_string(df_standings, label="A"):
+    """
+    Texto con formato C;label;rank;... a partir de los standings ordenados.
+
+    Args:
+        df_standings (pd.DataFrame): DataFrame con columnas "Team", "W", "L", "PF", "PA" y opcionalmente "Rank" y "GP"
+        label (str): valor que irá en la segunda columna (por defecto 'A')
+    Returns:
+        str: una línea por equipo
+    """
+    return txt_lines(df_standings, label)
+
+
+def generate_txt_standings_output(df_standings, filename="euroleague_standings_export.txt", label="A", out_dir=None):
+    """
+    Genera un archivo .txt con formato específico a partir de los standings ordenados.
+
+    Args:
+        df_standings (pd.DataFrame): DataFrame con columnas "Team", "W", "L", "PF", "PA" y opcionalmente "Rank" y "GP"
+        filename (str): nombre del archivo de salida .txt
+        label (str): valor que irá en la segunda columna del archivo (por defecto 'A')
+        out_dir (str): carpeta de salida (por defecto el directorio actual)
+    Returns:
+        Path: ruta del archivo de texto generado
+    """
+    return write_exports([(filename, label, df_standings)], out_dir)[0]
+
+
+# =====================================================
+# ---------------- RUNNERS ----------------------------
+# =====================================================
+
+def current_season(competition, store=None, offline=False):
+    """
+    Season to rank: fetched from the API (and upserted into store if given),
+    or memory-mapped from store without any network call when offline.
+    """
+    if offline:
+        return store.load(competition.code, competition.season)
+    season = load_season(competition)
+    if store is not None:
+        store.upsert(season)
+    return season
+
+
+def export_groups(competition, season, groups=None):
+    """
+    (filename, label, Season) of every table a competition season exports.
+
+    Competitions with groups export every round-robin group of the season
+    (older formats with four or more groups or a Top 16 as well), the groups
+    they list first and in that order; only the ones in groups when given.
+    Competitions without groups export the whole season, or its round-robin
+    groups once the season also holds play-off rounds.
+    """
+    if competition.groups:
+        listed = [g for g in competition.groups if g in season.groups]
+        names = listed + [g for g in season.round_robin_groups() if g not in listed]
+        return [(competition.group_filename(g), g, season.group_season(g))
+                for g in names if groups is None or g in groups]
+    if len(season.groups) <= 1:
+        return [(competition.filename, competition.label, season)]
+    names = season.round_robin_groups()
+    if len(names) == 1:
+        return [(competition.filename, competition.label, season.group_season(names[0]))]
+    stem, suffix = os.path.splitext(competition.filename)
+    return [(f"{stem}_{group_slug(g)}{suffix}", competition.label, season.group_season(g)) for g in names]
+
+
+def export_jobs(competition, season, groups=None):
+    """(filename, label, table) of every export of a competition season, see export_groups."""
+    return [(filename, label, group_season.table())
+            for filename, label, group_season in export_groups(competition, season, groups)]
+
+
+def run_euroleague_standings(competition=EUROLEAGUE, out_dir=None, store=None, offline=False, formats=("txt",)):
+    season = current_season(competition, store, offline)
+    paths = write_exports(export_jobs(competition, season), out_dir, formats)
+    for path in paths:
+        print(f"EuroLeague guardado en: {path}")
+    return paths
+
+
+def run_eurocup_group_standings(competition=EUROCUP, out_dir=None, store=None, offline=False, formats=("txt",)):
+    season = current_season(competition, store, offline)
+    paths = write_exports(export_jobs(competition, season), out_dir, formats)
+    for path in paths:
+        print(f"Guardado en: {path}")
+    return paths
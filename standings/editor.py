@@ -0,0 +1,78 @@
+"""Apply data_editor edits to a calendar through a game-key hash index.
+
+Games are identified by the stable key (Round, Local, Visitor). GameIndex maps
+each key to its row once, so an edit is a dict lookup plus vectorized writes
+instead of a boolean mask over the whole season. Edits are diffed against the
+previous rerun so only rows that actually changed are written.
+"""
+import numpy as np
+import pandas as pd
+
+EDIT_COLUMNS = ["Round", "Local", "Visitor", "HomeScore", "RoadScore", "Winner"]
+RESULT_COLUMNS = ["HomeScore", "RoadScore", "HomeWin", "RoadWin", "PlusMinus"]
+
+
+class GameIndex:
+    """Hash index from (round, local, visitor) to the row position of a calendar DataFrame."""
+
+    def __init__(self, df):
+        keys = zip(df["Round"].tolist(), df["Local"].tolist(), df["Visitor"].tolist())
+        self.positions = {key: k for k, key in enumerate(keys)}
+
+    def lookup(self, keys):
+        """Row positions of the keys, -1 for games not in the calendar."""
+        return np.array([self.positions.get(key, -1) for key in keys], dtype=np.int64)
+
+
+def _clean(value):
+    return None if pd.isna(value) else value
+
+
+def edit_rows(editable):
+    """{game key: (home score, road score, winner)} of a data_editor frame, NaN as None."""
+    keys = zip(editable["Round"].tolist(), editable["Local"].tolist(), editable["Visitor"].tolist())
+    values = zip(editable["HomeScore"].tolist(), editable["RoadScore"].tolist(), editable["Winner"].tolist())
+    return {key: (_clean(hs), _clean(rs), _clean(winner) or "") for key, (hs, rs, winner) in zip(keys, values)}
+
+
+def changed_rows(current, previous):
+    """Edits that differ from the previous rerun; rows removed since then map to None."""
+    if previous is None:
+        return dict(current)
+    changed = {key: value for key, value in current.items() if previous.get(key) != value}
+    changed.update({key: None for key in previous if key not in current})
+    return changed
+
+
+def apply_edits(df, base, index, changes):
+    """
+    Write changed edits into df in place.
+
+    Complete rows (both scores and a winner) set the result; incomplete or removed
+    rows restore the game's result from base, the calendar as fetched.
+
+    Args:
+        df (pd.DataFrame): working calendar, same rows as base
+        base (pd.DataFrame): calendar as fetched from the API
+        index (GameIndex): index over both frames
+        changes (dict): output of changed_rows
+    """
+    complete = {key: value for key, value in changes.items()
+                if value is not None and value[0] is not None and value[1] is not None
+                and value[2] in ("Local", "Visitor")}
+    restore = [key for key in changes if key not in complete]
+    columns = [df.columns.get_loc(c) for c in RESULT_COLUMNS]
+
+    positions = index.lookup(list(complete))
+    known = positions >= 0
+    if known.any():
+        values = np.array([value for value in complete.values()], dtype=object)[known]
+        hs = values[:, 0].astype(float)
+        rs = values[:, 1].astype(float)
+        home_win = (values[:, 2] == "Local").astype(float)
+        df.iloc[positions[known], columns] = np.column_stack([hs, rs, home_win, 1 - home_win, hs - rs])
+
+    positions = index.lookup(restore)
+    positions = positions[positions >= 0]
+    if len(positions):
+        df.iloc[positions, columns] = base.iloc[positions, columns].to_numpy()
@@ -0,0 +1,86 @@
+"""Batch export of ranked standings tables.
+
+All lines of a table are built with vectorized string concatenation, many
+tables (competitions, groups, seasons) are written in one call, and every file
+is written atomically so downstream graphics never read a half-written feed.
+Besides the classic C;label;rank;... .txt layout, tables can be exported as
+CSV, JSON and Parquet (the latter needs pyarrow).
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from standings import instrument
+from standings.files import atomic_write
+
+FORMATS = ("txt", "csv", "json", "parquet")
+EXPORT_COLUMNS = ["Label", "Rank", "Team", "GP", "W", "L", "PF", "PA", "Diff"]
+
+
+def export_frame(df_standings, label):
+    """Columns of the export layout: Rank and GP default to the row order and W + L."""
+    n = len(df_standings)
+    pf = np.rint(df_standings["PF"].to_numpy(dtype=float)).astype(np.int64)
+    pa = np.rint(df_standings["PA"].to_numpy(dtype=float)).astype(np.int64)
+    wins = df_standings["W"].to_numpy()
+    losses = df_standings["L"].to_numpy()
+    return pd.DataFrame({
+        "Label": [label] * n,
+        "Rank": df_standings["Rank"].to_numpy() if "Rank" in df_standings.columns else np.arange(1, n + 1),
+        "Team": df_standings["Team"].to_numpy(),
+        "GP": df_standings["GP"].to_numpy() if "GP" in df_standings.columns else wins + losses,
+        "W": wins, "L": losses, "PF": pf, "PA": pa, "Diff": pf - pa,
+    })
+
+
+def txt_lines(df_standings, label="A"):
+    """The C;label;rank;team;gp;w;l;pf;pa;diff;team lines of a table, joined by newlines."""
+    frame = export_frame(df_standings, label)
+    if frame.empty:
+        return ""
+    columns = [frame[c].astype(str) for c in EXPORT_COLUMNS] + [frame["Team"].astype(str)]
+    lines = pd.Series(["C"] * len(frame)).str.cat(columns, sep=";")
+    return "\n".join(lines.tolist())
+
+
+def render(df_standings, label, fmt):
+    """File contents of one table in one format, as bytes."""
+    if fmt == "txt":
+        return txt_lines(df_standings, label).encode("utf-8")
+    frame = export_frame(df_standings, label)
+    if fmt == "csv":
+        return frame.to_csv(index=False).encode("utf-8")
+    if fmt == "json":
+        return json.dumps(frame.to_dict(orient="records"), default=int).encode("utf-8")
+    if fmt == "parquet":
+        return frame.to_parquet(index=False)
+    raise ValueError(f"Unknown export format: {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+
+@instrument.stage("export")
+def write_exports(jobs, out_dir=None, formats=("txt",)):
+    """
+    Write many standings tables in one pass.
+
+    Args:
+        jobs (iterable): (filename, label, table) tuples; filename is the .txt name and
+            its suffix is swapped for the other formats
+        out_dir (str): output directory (current directory by default)
+        formats (iterable): any of FORMATS
+    Returns:
+        list: Path of every file written, in job then format order
+    """
+    out_dir = Path(out_dir or os.getcwd())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for filename, label, table in jobs:
+        instrument.add_rows(len(table))
+        for fmt in formats:
+            path = out_dir / Path(filename).with_suffix(f".{fmt}").name
+            data = render(table, label, fmt)
+            instrument.add_bytes(len(data))
+            paths.append(atomic_write(path, data))
+    return paths
@@ -0,0 +1,99 @@
+"""Concurrent fetcher for many (competition, season) calendars.
+
+Downloads run on a bounded thread pool through the shared response cache, with
+a per-host rate limit and retries with exponential backoff. Each worker streams
+its cached payload into the games parser as soon as it arrives, so the games
+tables are built while other seasons are still downloading.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+
+from standings.core import COMPETITIONS, parse_payload
+from standings.http_cache import default_cache
+
+
+class HostRateLimiter:
+    """Spaces out request starts to at most `per_second` per host."""
+
+    def __init__(self, per_second=10.0):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _retryable(exc):
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return False
+
+
+def fetch_with_retry(url, key, cache, limiter, retries=3, backoff=0.5):
+    """
+    Cached body path of url, retrying transient failures with exponential backoff.
+
+    Only requests that reach the network count against the per-host rate limit;
+    a body still fresh in the cache is returned straight away.
+    """
+    for attempt in range(retries + 1):
+        if not cache.is_fresh(url, key):
+            limiter.wait(url)
+        try:
+            return cache.fetch(url, key)
+        except requests.RequestException as exc:
+            if attempt == retries or not _retryable(exc):
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def fetch_many(pairs, max_workers=8, per_second=10.0, retries=3, backoff=0.5, cache=None, api_url=None):
+    """
+    Download and parse many competition seasons concurrently.
+
+    Args:
+        pairs (iterable): (competition code, season) tuples, e.g. [("E", 2024), ("U", 2024)]
+        max_workers (int): size of the download thread pool
+        per_second (float): maximum request starts per second and host
+        retries (int): extra attempts for connection errors, 429 and 5xx responses
+        backoff (float): first retry delay in seconds, doubled on every attempt
+        cache (ResponseCache): response cache, the default one if None
+        api_url (str): endpoint template with {code} and {season}, the live API if None
+    Returns:
+        dict: {(code, season): (games DataFrame, sanctioned team codes)}
+    """
+    cache = cache or default_cache()
+    limiter = HostRateLimiter(per_second)
+
+    def load(code, season):
+        competition = COMPETITIONS[code].for_season(season)
+        if api_url:
+            competition = competition.with_api_url(api_url)
+        path = fetch_with_retry(competition.url, competition.key, cache, limiter, retries, backoff)
+        with path.open("rb") as stream:
+            return parse_payload(stream, competition.detect_sanctioned)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(load, code, season): (code, season) for code, season in pairs}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def season_range(code, first, last):
+    """(code, season) pairs for every season from first to last, both included."""
+    return [(code, season) for season in range(first, last + 1)]
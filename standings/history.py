@@ -0,0 +1,236 @@
+"""Cross-season queries over precomputed standings summaries.
+
+A History ranks every stored season once, table by table (see
+core.export_groups), and keeps three summary DataFrames:
+
+- ranks: one row per team and final position, with the size of its tie on
+  wins and whether the head-to-head mini-table or the general criteria
+  fixed its place
+- ties: one row per group of teams level on wins, resolved by "h2h",
+  "fallback" or "h2h+fallback" when the mini-table split the group but left
+  a subset to the general criteria
+- h2h: one row per team and opponent, their head-to-head record
+
+Lookup copies indexed by team and by rank are kept next to them, so queries
+such as "every season where a 20-14 team missed the top 10" are index lookups
+and filters instead of re-ranking every season. update() only re-ranks the
+partitions of the store that changed since the last build, and the tables can
+be saved to and loaded from a directory as CSV files plus their column dtypes,
+a data-only format that loading never executes. Every query answers with an
+empty frame, or tables=0, when nothing matches or the store is empty.
+"""
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from standings.batch import rank_all
+from standings.core import COMPETITIONS, export_groups
+from standings.files import atomic_write
+from standings.tiebreak import fallback_order, name_ranks, resolve_group, tie_groups
+
+TABLES = ("ranks", "ties", "h2h")
+COLUMNS = {
+    "ranks": ["Code", "Season", "Group", "Rank", "Team", "ClubName", "W", "L", "PF", "PA", "Diff",
+              "Sanctioned", "Teams", "TieSize", "TieMethod"],
+    "ties": ["Code", "Season", "Group", "W", "Size", "Method", "FirstRank", "Members"],
+    "h2h": ["Code", "Season", "Group", "Team", "Opponent", "W", "L", "PF", "PA"],
+}
+
+
+def _empty(name):
+    return pd.DataFrame({column: pd.Series(dtype=object) for column in COLUMNS[name]})
+
+
+def _lookup(frame, key):
+    """Rows of a frame with a sorted index whose label is key, empty when there are none."""
+    return frame.iloc[frame.index.searchsorted(key, "left"):frame.index.searchsorted(key, "right")]
+
+
+def _fingerprint(store, code, season):
+    return store.meta_path(code, season).stat().st_mtime_ns
+
+
+def summarize(code, year, group, season, order):
+    """(ranks, ties, h2h) summary frames of one ranked table."""
+    wins, losses, pf, pa = season.totals()
+    h2h_wins, h2h_points, h2h_games = season.head_to_head()
+    teams = np.array(season.teams, dtype=object)
+    name_rank = name_ranks(season.names)
+    n = len(order)
+
+    def fallback(group):
+        return fallback_order(group, wins + losses, pf, pa, name_rank, season.sanctioned)
+
+    tie_size = np.ones(n, dtype=np.int64)
+    method = np.full(n, "", dtype=object)
+    tie_rows = []
+    start = 0
+    for tied in tie_groups(order, wins):
+        size = len(tied)
+        if size > 1:
+            # Replay the resolution to learn which criteria placed each team
+            record = {}
+            resolve_group(tied, h2h_wins, h2h_points, h2h_games, fallback, record)
+            placed = [record[team] for team in tied.tolist()]
+            how = placed[0] if len(set(placed)) == 1 else "h2h+fallback"
+            tie_size[start:start + size] = size
+            method[start:start + size] = placed
+            tie_rows.append((int(wins[tied[0]]), size, how, start + 1, ",".join(teams[tied])))
+        start += size
+
+    key = {"Code": code, "Season": year, "Group": group}
+    ranks = pd.DataFrame({
+        **key, "Rank": np.arange(1, n + 1), "Team": teams[order],
+        "ClubName": np.array(season.names, dtype=object)[order],
+        "W": wins[order], "L": losses[order], "PF": pf[order], "PA": pa[order], "Diff": (pf - pa)[order],
+        "Sanctioned": season.sanctioned[order], "Teams": n, "TieSize": tie_size, "TieMethod": method,
+    })
+    ties = pd.DataFrame(tie_rows, columns=["W", "Size", "Method", "FirstRank", "Members"])
+    ties.insert(0, "Group", group)
+    ties.insert(0, "Season", year)
+    ties.insert(0, "Code", code)
+
+    team, opponent = np.nonzero(h2h_games)
+    h2h = pd.DataFrame({
+        **key, "Team": teams[team], "Opponent": teams[opponent],
+        "W": h2h_wins[team, opponent], "L": h2h_wins[opponent, team],
+        "PF": h2h_points[team, opponent], "PA": h2h_points[opponent, team],
+    })
+    return ranks, ties, h2h
+
+
+class History:
+    """Summary tables of every ranked season of a GameStore."""
+
+    def __init__(self, ranks=None, ties=None, h2h=None, fingerprints=None):
+        self.ranks = _empty("ranks") if ranks is None else ranks
+        self.ties = _empty("ties") if ties is None else ties
+        self.h2h = _empty("h2h") if h2h is None else h2h
+        self.fingerprints = dict(fingerprints or {})
+        self._index()
+
+    @classmethod
+    def build(cls, store, processes=None):
+        """Rank every partition of store (on a process pool, see batch.rank_all) and summarize it."""
+        history = cls()
+        history.update(store, processes)
+        return history
+
+    def update(self, store, processes=None):
+        """
+        Re-rank the partitions added or changed since the last build and drop the removed ones.
+
+        Returns:
+            list: (code, season) pairs that were re-ranked
+        """
+        current = {pair: _fingerprint(store, *pair) for pair in store.partitions()}
+        stale = [pair for pair, stamp in current.items() if self.fingerprints.get(pair) != stamp]
+        dropped = set(self.fingerprints) - set(current)
+        if not stale and not dropped:
+            return []
+
+        jobs = []
+        for code, year in stale:
+            competition = COMPETITIONS[code].for_season(year)
+            for _, _, season in export_groups(competition, store.load(code, year)):
+                group = season.groups[0] if len(season.groups) == 1 else ""
+                jobs.append((code, year, group, season))
+        orders = rank_all([season for *_, season in jobs], processes)
+        parts = [summarize(*job, order) for job, order in zip(jobs, orders)]
+
+        removed = set(stale) | dropped
+        for k, name in enumerate(TABLES):
+            old = getattr(self, name)
+            old = old[[pair not in removed for pair in zip(old["Code"], old["Season"])]]
+            frames = [f for f in [old] + [part[k] for part in parts] if len(f)]
+            if frames:
+                table = pd.concat(frames, ignore_index=True)
+                table = table.sort_values(["Code", "Season", "Group"], kind="stable").reset_index(drop=True)
+            else:
+                table = _empty(name)
+            setattr(self, name, table)
+        self.fingerprints = current
+        self._index()
+        return stale
+
+    def _index(self):
+        self.by_team = self.ranks.set_index("Team").sort_index(kind="stable")
+        self.by_rank = self.ranks.set_index("Rank").sort_index(kind="stable")
+
+    # ---------------- persistence ----------------
+
+    @staticmethod
+    def saved(directory):
+        """Whether directory holds tables written by save."""
+        return (Path(directory) / "fingerprints.json").exists() and (Path(directory) / "dtypes.json").exists()
+
+    def save(self, directory):
+        """Write every table as CSV, with its column dtypes and the partition fingerprints as JSON."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        dtypes = {}
+        for name in TABLES:
+            table = getattr(self, name)
+            atomic_write(directory / f"{name}.csv", table.to_csv(index=False).encode("utf-8"))
+            dtypes[name] = {column: str(dtype) for column, dtype in table.dtypes.items()}
+        atomic_write(directory / "dtypes.json", json.dumps(dtypes).encode("utf-8"))
+        stamps = [[code, season, stamp] for (code, season), stamp in self.fingerprints.items()]
+        atomic_write(directory / "fingerprints.json", json.dumps(stamps).encode("utf-8"))
+        return directory
+
+    @classmethod
+    def load(cls, directory):
+        """History written by save."""
+        directory = Path(directory)
+        dtypes = json.loads((directory / "dtypes.json").read_text(encoding="utf-8"))
+        tables = {}
+        for name in TABLES:
+            text = (directory / f"{name}.csv").read_text(encoding="utf-8")
+            # Strings stay strings: an empty Group or TieMethod must not come back as NaN
+            tables[name] = pd.read_csv(io.StringIO(text), dtype=dtypes[name], keep_default_na=False)
+        stamps = json.loads((directory / "fingerprints.json").read_text(encoding="utf-8"))
+        return cls(fingerprints={(code, season): stamp for code, season, stamp in stamps}, **tables)
+
+    # ---------------- queries ----------------
+
+    def team(self, team):
+        """Every final position of a team, by season."""
+        return _lookup(self.by_team, team).reset_index()
+
+    def at_rank(self, rank, code=None):
+        """Teams that finished at rank, optionally in one competition."""
+        rows = _lookup(self.by_rank, rank).reset_index()
+        return rows if code is None else rows[rows["Code"] == code]
+
+    def wins_for_rank(self, rank, code=None):
+        """Mean, min and max wins of the team finishing at rank, with the number of tables (None without any)."""
+        wins = self.at_rank(rank, code)["W"]
+        if not len(wins):
+            return {"rank": rank, "tables": 0, "mean": None, "min": None, "max": None}
+        return {"rank": rank, "tables": len(wins), "mean": float(wins.mean()),
+                "min": int(wins.min()), "max": int(wins.max())}
+
+    def missed_top(self, wins, losses, top, code=None):
+        """Teams with a W-L record that still finished below the top positions."""
+        rows = self.ranks[(self.ranks["W"] == wins) & (self.ranks["L"] == losses) & (self.ranks["Rank"] > top)]
+        return rows if code is None else rows[rows["Code"] == code]
+
+    def tie_usage(self, size=None, method=None, code=None):
+        """Ties on wins of a size, resolved with a method ("h2h", "fallback" or "h2h+fallback")."""
+        ties = self.ties
+        mask = np.ones(len(ties), dtype=bool)
+        if size is not None:
+            mask &= ties["Size"].to_numpy() == size
+        if method is not None:
+            mask &= ties["Method"].to_numpy() == method
+        if code is not None:
+            mask &= ties["Code"].to_numpy() == code
+        return ties[mask]
+
+    def head_to_head(self, team, opponent):
+        """Head-to-head record of team against opponent in every table they shared."""
+        h2h = self.h2h
+        return h2h[(h2h["Team"] == team) & (h2h["Opponent"] == opponent)]
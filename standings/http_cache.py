@@ -0,0 +1,143 @@
+"""On-disk cache for the games API with conditional revalidation.
+
+Responses are stored per key (competition code + season) as the raw body plus
+a small metadata file with the ETag / Last-Modified validators. Within the TTL
+the body is served from disk without touching the network; after it, the
+request is revalidated with If-None-Match / If-Modified-Since and a 304 only
+refreshes the timestamp; a 304 that does not answer a revalidation is an
+error. Every request goes through one pooled Session and its response is
+closed on every path so the connection returns to the pool.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from standings import instrument
+from standings.files import atomic_write
+
+DEFAULT_TTL = 60
+CHUNK_SIZE = 1 << 16
+DEFAULT_DIR = Path(os.environ.get("STANDINGS_CACHE_DIR", Path.home() / ".cache" / "standings"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide requests.Session with a connection pool shared by every fetch."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+class ResponseCache:
+    """Directory of cached response bodies keyed by competition and season."""
+
+    def __init__(self, directory=DEFAULT_DIR, ttl=DEFAULT_TTL, session=None):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.session = session
+
+    def _paths(self, key):
+        return self.directory / f"{key}.body", self.directory / f"{key}.meta.json"
+
+    def _read_meta(self, key):
+        body_path, meta_path = self._paths(key)
+        if not (body_path.exists() and meta_path.exists()):
+            return None
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+    def _write(self, key, meta, body=None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        body_path, meta_path = self._paths(key)
+        if body is not None:
+            atomic_write(body_path, body)
+        atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def is_fresh(self, url, key):
+        """Whether fetch(url, key) would be served from disk without a request."""
+        meta = self._read_meta(key)
+        return meta is not None and meta.get("url") == url and time.time() - meta["fetched_at"] < self.ttl
+
+    def get(self, url, key, timeout=30):
+        """Response body for url as bytes; see fetch."""
+        return self.fetch(url, key, timeout).read_bytes()
+
+    @instrument.stage("fetch")
+    def fetch(self, url, key, timeout=30):
+        """
+        Make sure the cached body of url is fresh, revalidating it if needed.
+
+        Args:
+            url (str): endpoint to fetch
+            key (str): cache entry name, e.g. "E2025"
+            timeout (float): request timeout in seconds
+        Returns:
+            Path: file holding the response body, ready to be streamed
+        """
+        body_path, _ = self._paths(key)
+        meta = self._read_meta(key)
+        now = time.time()
+        if meta is not None and meta.get("url") == url and now - meta["fetched_at"] < self.ttl:
+            return body_path
+
+        headers = {}
+        if meta is not None and meta.get("url") == url:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        session = self.session or get_session()
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 or not response.ok:
+                # Drain the short body so closing hands the connection back to the pool.
+                response.content
+            if response.status_code == 304:
+                # Only a revalidation of the stored body may answer 304.
+                if not headers:
+                    raise requests.HTTPError(f"304 Not Modified for {url} without a cached body", response=response)
+                meta["fetched_at"] = now
+                self._write(key, meta)
+                return body_path
+
+            response.raise_for_status()
+            self._write(key, {
+                "url": url,
+                "fetched_at": now,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }, response.iter_content(CHUNK_SIZE))
+        if instrument.active():
+            instrument.add_bytes(body_path.stat().st_size)
+        return body_path
+
+    def invalidate(self, key):
+        """Drop a cached entry so the next get goes to the network."""
+        for path in self._paths(key):
+            if path.exists():
+                path.unlink()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Cache under $STANDINGS_CACHE_DIR (or ~/.cache/standings) used when none is given."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
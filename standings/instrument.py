@@ -0,0 +1,247 @@
+"""Stage instrumentation for fetch, parse, compute, resolve and export.
+
+Functions on the hot path are wrapped with @stage("name"). While
+instrumentation is off (the default) the wrapper only checks one module flag
+before calling through. Once enable() is called every stage accumulates calls,
+wall time, CPU time, rows processed, bytes (fetched from the API or written to
+disk) and, with trace_memory, the tracemalloc allocation peak. Stages nest:
+the times of "resolve" include the "compute" it runs.
+
+report() returns the totals as a dict, to_json() and to_prometheus() render
+them, and with profile=True a cProfile run covers everything between enable()
+and dump(). Setting STANDINGS_INSTRUMENT=1 (or true / yes) enables it at import
+time; 0, false or an empty value leave it off.
+"""
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+STAGES = ("fetch", "parse", "compute", "resolve", "export")
+
+_enabled = False
+_profiler = None
+_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+
+
+class _Record:
+    __slots__ = ("name", "rows", "bytes", "peak", "base")
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.bytes = 0
+        self.peak = 0
+        self.base = 0
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _fold_peak(stack):
+    # tracemalloc has a single peak; fold it into every open stage before resetting it
+    current, peak = tracemalloc.get_traced_memory()
+    for record in stack:
+        record.peak = max(record.peak, peak - record.base)
+    tracemalloc.reset_peak()
+    return current
+
+
+def active():
+    """True while instrumentation is on."""
+    return _enabled
+
+
+def enable(profile=False, trace_memory=False):
+    """
+    Start recording stages.
+
+    Args:
+        profile (bool): also run cProfile until dump() or disable()
+        trace_memory (bool): record allocation peaks with tracemalloc (slows allocations down)
+    """
+    global _enabled, _profiler
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profile and _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    _enabled = True
+
+
+def disable():
+    """Stop recording and profiling; the totals stay available until reset()."""
+    global _enabled, _profiler
+    _enabled = False
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+class measure:
+    """Context manager recording one run of a stage; a no-op while instrumentation is off."""
+
+    __slots__ = ("record", "wall", "cpu")
+
+    def __init__(self, name):
+        self.record = _Record(name) if _enabled else None
+
+    def __enter__(self):
+        if self.record is not None:
+            stack = _stack()
+            if tracemalloc.is_tracing():
+                self.record.base = _fold_peak(stack)
+            stack.append(self.record)
+            self.wall = time.perf_counter()
+            self.cpu = time.process_time()
+        return self.record
+
+    def __exit__(self, *exc):
+        record = self.record
+        if record is None:
+            return False
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        stack = _stack()
+        if tracemalloc.is_tracing():
+            _fold_peak(stack)
+        stack.remove(record)
+        with _lock:
+            totals = _stats.setdefault(record.name, {
+                "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "bytes": 0, "alloc_peak_bytes": 0,
+            })
+            totals["calls"] += 1
+            totals["wall_s"] += wall
+            totals["cpu_s"] += cpu
+            totals["rows"] += record.rows
+            totals["bytes"] += record.bytes
+            totals["alloc_peak_bytes"] = max(totals["alloc_peak_bytes"], record.peak)
+        return False
+
+
+def stage(name, rows=None):
+    """
+    Decorator recording every call of a function as a run of stage name.
+
+    Args:
+        name (str): stage name, usually one of STAGES
+        rows (callable): rows(result, args) -> number of rows processed by the call
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with measure(name) as record:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    record.rows += rows(result, args)
+            return result
+        return wrapper
+    return decorate
+
+
+def add_rows(n):
+    """Count rows processed in the innermost open stage."""
+    if _enabled:
+        stack = _stack()
+        if stack:
+            stack[-1].rows += n
+
+
+def add_bytes(n):
+    """Count bytes fetched or written in the innermost open stage."""
+    if _enabled:
+        stack = _stack()
+        if stack:
+            stack[-1].bytes += n
+
+
+def report():
+    """Totals per stage: calls, wall_s, cpu_s, rows, bytes and alloc_peak_bytes."""
+    with _lock:
+        return {"stages": {name: dict(totals) for name, totals in _stats.items()}}
+
+
+def to_json():
+    return json.dumps(report(), indent=2)
+
+
+_METRICS = (
+    ("calls", "calls_total", "counter", "Runs of each stage."),
+    ("wall_s", "wall_seconds_total", "counter", "Wall time spent in each stage."),
+    ("cpu_s", "cpu_seconds_total", "counter", "CPU time spent in each stage."),
+    ("rows", "rows_total", "counter", "Rows (games or teams) processed by each stage."),
+    ("bytes", "bytes_total", "counter", "Bytes fetched or written by each stage."),
+    ("alloc_peak_bytes", "alloc_peak_bytes", "gauge", "Largest tracemalloc peak of a single run of each stage."),
+)
+
+
+def to_prometheus(prefix="standings_stage"):
+    """The report in the Prometheus text exposition format."""
+    stages = report()["stages"]
+    lines = []
+    for key, metric, kind, help_text in _METRICS:
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} {kind}")
+        for name, totals in stages.items():
+            lines.append(f'{prefix}_{metric}{{stage="{name}"}} {totals[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path):
+    """Write the report to path: Prometheus text for .prom/.txt, JSON otherwise."""
+    path = Path(path)
+    text = to_prometheus() if path.suffix in (".prom", ".txt") else to_json()
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def dump(directory, top=25):
+    """
+    Write the profiling data collected since enable() into directory.
+
+    Writes profile.pstats (open with python -m pstats) when profiling, and
+    tracemalloc.txt with the top allocation sites when tracing memory.
+    Returns:
+        list: Path of every file written
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(directory / "profile.pstats")
+        _profiler.enable()
+        written.append(directory / "profile.pstats")
+    if tracemalloc.is_tracing():
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        (directory / "tracemalloc.txt").write_text("\n".join(str(s) for s in stats) + "\n", encoding="utf-8")
+        written.append(directory / "tracemalloc.txt")
+    return written
+
+
+def env_flag(value):
+    """Whether an environment variable value turns a feature on ("1", "true" or "yes", any case)."""
+    return (value or "").strip().lower() in ("1", "true", "yes")
+
+
+if env_flag(os.environ.get("STANDINGS_INSTRUMENT")):
+    enable()
@@ -0,0 +1,335 @@
+"""Streaming parser for the games payload.
+
+Games are decoded one at a time from the response stream (with ijson when it
+is installed, otherwise with an incremental json.JSONDecoder over fixed-size
+chunks) and written straight into typed NumPy columns: team and group codes as
+small integer categories, scores as int16 and the result as int8 with
+UNPLAYED as sentinel. The full decoded payload is never held in memory.
+
+Each game is first checked against GAME_SCHEMA, compiled once into a
+generated validator function: a malformed game is set aside in "rejected"
+with the reason instead of crashing the run. Valid games get an explicit
+state: SCHEDULED and LIVE games count as unplayed (a 0-0 or a tied live score
+never becomes a result), FINAL and FORFEIT games count, and the loser of a
+20-0 forfeit is the sanctioned team. Every game also gets a 64-bit
+hash of its content, so diff_games can tell which games changed between two
+polls of the same feed.
+"""
+import codecs
+import hashlib
+import json
+import logging
+import re
+
+import numpy as np
+
+from standings import instrument
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+UNPLAYED = -1
+CHUNK_SIZE = 1 << 16
+
+SCHEDULED, LIVE, FINAL, FORFEIT = range(4)
+STATES = ("scheduled", "live", "final", "forfeit")
+FORFEIT_SCORE = 20
+
+_DATA_START = re.compile(r'"data"\s*:\s*\[')
+_SEPARATORS = " \t\r\n,"
+
+
+def _iter_items_chunked(stream, chunk_size=CHUNK_SIZE):
+    """Yield every element of the top-level "data" array, decoding chunk by chunk."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+
+    def more():
+        nonlocal buf
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return False
+        buf += text.decode(chunk) if isinstance(chunk, bytes) else chunk
+        return True
+
+    while True:
+        match = _DATA_START.search(buf)
+        if match:
+            buf = buf[match.end():]
+            break
+        if not more():
+            raise ValueError('Games payload has no "data" array')
+
+    pos = 0
+    while True:
+        while pos < len(buf) and buf[pos] in _SEPARATORS:
+            pos += 1
+        if pos == len(buf):
+            buf, pos = "", 0
+            if not more():
+                raise ValueError("Games payload ended inside the data array")
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Game split across chunks: keep the tail and read more
+            buf, pos = buf[pos:], 0
+            if not more():
+                raise
+            continue
+        yield item
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def iter_games(stream):
+    """Game dicts of a payload stream (binary file object), one at a time."""
+    if ijson is not None:
+        return ijson.items(stream, "data.item", use_float=True)
+    return _iter_items_chunked(stream)
+
+
+class _Codes:
+    """Stable small-integer codes for repeated strings, in order of first appearance."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def get(self, value):
+        code = self.ids.get(value)
+        if code is None:
+            code = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+COLUMNS = {
+    "game_code": np.int32, "round": np.int16, "group": np.int8,
+    "local": np.int16, "road": np.int16,
+    "home_score": np.int16, "road_score": np.int16, "home_win": np.int8,
+    "state": np.int8, "hash": np.uint64,
+}
+
+# ---------------- schema ----------------
+
+NUMBER = (int, float)
+# Bounds of the integer columns the values are stored in
+INT16 = (int(np.iinfo(np.int16).min), int(np.iinfo(np.int16).max))
+INT32 = (int(np.iinfo(np.int32).min), int(np.iinfo(np.int32).max))
+TEAM_SCHEMA = {
+    "club": (True, {"code": (True, str), "name": (True, str)}),
+    "score": (True, NUMBER, INT16),
+    "standingsScore": (False, NUMBER, INT16),
+}
+# key -> (required, type(s) or nested schema[, (min, max)]); optional keys may also be null
+GAME_SCHEMA = {
+    "gameCode": (False, int, INT32),
+    "round": (True, int, INT16),
+    "played": (False, bool),
+    "group": (False, {"rawName": (False, str)}),
+    "local": (True, TEAM_SCHEMA),
+    "road": (True, TEAM_SCHEMA),
+}
+
+
+def compile_schema(schema, name="game"):
+    """
+    Compile a schema dict into a validator function.
+
+    The checks are generated as straight-line Python source (one dict lookup
+    and one exact type test per key, plus a range test for bounded numbers,
+    nested objects inlined) and compiled once, so validating a game costs no recursion or schema walking. Exact type
+    tests also keep bools out of int fields.
+
+    Returns:
+        callable: validate(value) -> None when valid, otherwise the first violation as a message
+    """
+    lines = ["def validate(v0):", f"    if type(v0) is not dict: return {name + ' is not an object'!r}"]
+    types = {}
+
+    def emit(node, var, path, indent):
+        pad = " " * indent
+        for key, (required, kind, *bounds) in node.items():
+            k = len(types) + 1
+            child, where = f"v{k}", f"{path}.{key}" if path else key
+            if isinstance(kind, dict):
+                types[f"t{k}"] = (dict,)
+            else:
+                types[f"t{k}"] = kind if isinstance(kind, tuple) else (kind,)
+            lines.append(f"{pad}{child} = {var}.get({key!r})")
+            lines.append(f"{pad}if {child} is None: " + (f"return {'missing ' + where!r}" if required else "pass"))
+            lines.append(f"{pad}elif type({child}) not in t{k}: "
+                         f"return {where + ' has type '!r} + type({child}).__name__")
+            if bounds:
+                # Also false for NaN
+                lines.append(f"{pad}elif not {bounds[0][0]} <= {child} <= {bounds[0][1]}: "
+                             f"return {where + ' out of range: '!r} + repr({child})")
+            if isinstance(kind, dict):
+                lines.append(f"{pad}else:")
+                emit(kind, child, where, indent + 4)
+
+    emit(schema, "v0", "", 4)
+    lines.append("    return None")
+    namespace = dict(types)
+    exec(compile("\n".join(lines), f"<schema {name}>", "exec"), namespace)
+    return namespace["validate"]
+
+
+validate_game = compile_schema(GAME_SCHEMA)
+
+
+def game_state(played, l_score, v_score):
+    """
+    State of a game from the API's played flag and the two scores.
+
+    Without a played flag, a game with different scores is taken as final.
+    Raises ValueError for a finished game with a tied score.
+    """
+    if played is None:
+        played = l_score != v_score
+    if not played:
+        return LIVE if l_score or v_score else SCHEDULED
+    if l_score == v_score:
+        raise ValueError(f"final score is tied {l_score}-{v_score}")
+    if min(l_score, v_score) == 0 and max(l_score, v_score) == FORFEIT_SCORE:
+        return FORFEIT
+    return FINAL
+
+
+def game_hash(*fields):
+    """64-bit content hash of the fields that define a game's result."""
+    return int.from_bytes(hashlib.blake2b(repr(fields).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def parse_stream(stream, detect_sanctioned=False, capacity=512):
+    """parse_items over the games of a binary payload stream."""
+    return parse_items(iter_games(stream), detect_sanctioned, capacity)
+
+
+@instrument.stage("parse", rows=lambda parsed, args: len(parsed["local"]))
+def parse_items(games, detect_sanctioned=False, capacity=512):
+    """
+    Validate game dicts and parse them into typed columns.
+
+    Args:
+        games (iterable): game objects of the "data" array
+        detect_sanctioned (bool): collect teams that lost a game 20-0
+        capacity (int): initial number of rows preallocated, doubled when full
+    Returns:
+        dict: the int columns of COLUMNS trimmed to the number of valid games,
+        plus "teams" (codes by id), "names" (club names by id), "groups" (group
+        names by id), "sanctioned" (list of team codes) and "rejected" (list of
+        (position in the payload, gameCode, reason) of the malformed games)
+    """
+    columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+    teams, groups = _Codes(), _Codes()
+    names = {}
+    sanctioned = set()
+    rejected = []
+    n = 0
+
+    for position, game in enumerate(games):
+        try:
+            error = validate_game(game)
+            if error:
+                raise ValueError(error)
+            local, road = game["local"], game["road"]
+            l_score, v_score = local["score"], road["score"]
+            state = game_state(game.get("played"), l_score, v_score)
+        except ValueError as exc:
+            code = game.get("gameCode") if isinstance(game, dict) else None
+            rejected.append((position, code, str(exc)))
+            continue
+
+        if n == len(columns["local"]):
+            for name, col in columns.items():
+                columns[name] = np.resize(col, 2 * len(col))
+
+        l_code, v_code = local["club"]["code"], road["club"]["code"]
+        l_team, v_team = teams.get(l_code), teams.get(v_code)
+        names[l_team] = local["club"]["name"]
+        names[v_team] = road["club"]["name"]
+        group = (game.get("group") or {}).get("rawName")
+        game_code = game.get("gameCode") or 0
+
+        columns["game_code"][n] = game_code
+        columns["round"][n] = game["round"]
+        columns["group"][n] = groups.get(group)
+        columns["local"][n] = l_team
+        columns["road"][n] = v_team
+        columns["state"][n] = state
+
+        if state >= FINAL:
+            # standingsScore is optional and may be null: fall back to the score
+            l_points = local.get("standingsScore")
+            v_points = road.get("standingsScore")
+            l_points = l_score if l_points is None else l_points
+            v_points = v_score if v_points is None else v_points
+            columns["home_score"][n] = l_points
+            columns["road_score"][n] = v_points
+            columns["home_win"][n] = l_score > v_score
+            if detect_sanctioned and state == FORFEIT:
+                sanctioned.add(v_code if l_score > v_score else l_code)
+        else:
+            l_points = v_points = 0
+            columns["home_score"][n] = 0
+            columns["road_score"][n] = 0
+            columns["home_win"][n] = UNPLAYED
+        columns["hash"][n] = game_hash(game_code, game["round"], group, l_code, v_code,
+                                       state, l_score, v_score, l_points, v_points)
+        n += 1
+
+    if rejected:
+        logger.warning("Skipped %d malformed games, first: %s", len(rejected), rejected[0])
+    parsed = {name: col[:n].copy() for name, col in columns.items()}
+    parsed["teams"] = teams.values
+    parsed["names"] = [names[k] for k in range(len(teams.values))]
+    parsed["groups"] = groups.values
+    parsed["sanctioned"] = sorted(sanctioned)
+    parsed["rejected"] = rejected
+    return parsed
+
+
+def game_keys(parsed):
+    """(group, round, local code, road code) of every parsed game, the identity used by diff_games."""
+    teams = np.array(parsed["teams"], dtype=object)
+    groups = np.array(parsed["groups"] or [None], dtype=object)
+    return list(zip(groups[parsed["group"]], parsed["round"].tolist(),
+                    teams[parsed["local"]], teams[parsed["road"]]))
+
+
+def diff_games(previous, parsed):
+    """
+    Games added, changed or removed since a previous poll of the same feed.
+
+    Args:
+        previous (dict): game key -> hash from the previous poll, or None for the first one
+        parsed (dict): parse_items result of the current poll
+    Returns:
+        tuple: (current key -> hash dict to keep for the next poll,
+        row positions in parsed of the added or changed games,
+        keys of the removed games)
+    """
+    keys, values = game_keys(parsed), parsed["hash"].tolist()
+    hashes = dict(zip(keys, values))
+    if previous is None:
+        return hashes, np.arange(len(keys)), []
+    changed = np.flatnonzero([previous.get(key) != value for key, value in zip(keys, values)])
+    removed = [key for key in previous if key not in hashes]
+    return hashes, changed, removed
+
+
+def to_dataframe(parsed):
+    """The classic games DataFrame (Local, Visitor, ..., Round, Group) of a parsed payload."""
+    from standings.season import Season
+
+    return Season.from_parsed(parsed).to_dataframe()
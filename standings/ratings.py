@@ -0,0 +1,140 @@
+"""Schedule strength and margin ratings from a calendar.
+
+Everything is derived from the Round, Local, Visitor and PlusMinus columns
+of actual_calendar() / eurocup_calendar_2025() through the games x teams
+incidence matrix A (+1 for the home team, -1 for the visitor of each game).
+A is never materialized: its products are scatter-adds with np.bincount, so
+A.T @ y is two bincounts and A.T @ A (the graph Laplacian of played games)
+comes from a bincount over home * n + away pairs.
+
+The least-squares margin rating solves the normal equations of
+PlusMinus ~ rating[home] - rating[visitor] + home_advantage with ratings
+summing to zero, a (teams + 2)-sized linear system. The whole metrics table
+of a 20-team, 38-round season takes a couple of milliseconds, so it can be
+recomputed after every result. margin_model plugs the ratings into
+simulate_positions.
+"""
+import numpy as np
+import pandas as pd
+
+
+def schedule_arrays(df):
+    """(teams, home ids, away ids, played mask, home margin) of a calendar; unplayed margins are 0."""
+    teams = pd.unique(df[["Local", "Visitor"]].values.ravel())
+    teams = pd.Index([team for team in teams if not pd.isna(team)])
+    home = teams.get_indexer(df["Local"])
+    away = teams.get_indexer(df["Visitor"])
+    known = (home >= 0) & (away >= 0)
+    margin = df["PlusMinus"].to_numpy(dtype=float)[known]
+    played = ~np.isnan(margin)
+    return teams, home[known], away[known], played, np.where(played, margin, 0.0)
+
+
+def pair_counts(home, away, n_teams):
+    """Symmetric team x team count of games between every pair (A.T @ A off the diagonal, negated)."""
+    counts = np.bincount(home * n_teams + away, minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+    return counts + counts.T
+
+
+def margin_ratings(home, away, margin, n_teams, home_advantage=True):
+    """
+    Least-squares margin rating of every team.
+
+    Args:
+        home, away (np.ndarray): team ids of the played games
+        margin (np.ndarray): home score minus road score of each game
+        n_teams (int): number of team ids
+        home_advantage (bool): fit a common home-court term as well
+    Returns:
+        tuple: (ratings summing to 0, home advantage in points, residual standard deviation)
+    """
+    n = n_teams
+    games = pair_counts(home, away, n)
+    # Normal equations X.T X [r, h] = X.T y, plus a Lagrange row for sum(r) = 0
+    system = np.zeros((n + 2, n + 2))
+    system[:n, :n] = np.diag(games.sum(axis=1)) - games
+    rhs = np.zeros(n + 2)
+    rhs[:n] = np.bincount(home, weights=margin, minlength=n) - np.bincount(away, weights=margin, minlength=n)
+    system[:n, n + 1] = system[n + 1, :n] = 1
+    if home_advantage and len(home):
+        venue = np.bincount(home, minlength=n) - np.bincount(away, minlength=n)
+        system[:n, n] = system[n, :n] = venue
+        system[n, n] = len(home)
+        rhs[n] = margin.sum()
+    else:
+        system[n, n] = 1
+    solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+    ratings, hca = solution[:n], solution[n]
+
+    residual = margin - (ratings[home] - ratings[away] + hca)
+    sigma = float(np.sqrt((residual ** 2).sum() / max(len(margin) - n, 1))) if len(margin) else 0.0
+    return ratings, float(hca), sigma
+
+
+def schedule_metrics(df):
+    """
+    Per-team schedule and rating metrics of a calendar.
+
+    Args:
+        df (pd.DataFrame): calendar as returned by actual_calendar() or eurocup_calendar_2025()
+    Returns:
+        pd.DataFrame: indexed by team code, with GP, W, L, WinPct, home and road
+        W / L / Diff splits, OppWinPct (opponents' win percentage over the games
+        played against them), Rating (least-squares margin rating), SOS (mean
+        rating of the opponents played), RemainingGames, RemainingSOS and
+        RemainingOppWinPct over the unplayed games
+    """
+    teams, home, away, played, margin = schedule_arrays(df)
+    n = len(teams)
+    ph, pa, pm = home[played], away[played], margin[played]
+    home_won = pm > 0
+
+    home_w = np.bincount(ph[home_won], minlength=n)
+    home_l = np.bincount(ph[~home_won], minlength=n)
+    road_w = np.bincount(pa[~home_won], minlength=n)
+    road_l = np.bincount(pa[home_won], minlength=n)
+    home_diff = np.bincount(ph, weights=pm, minlength=n)
+    road_diff = -np.bincount(pa, weights=pm, minlength=n)
+    wins, gp = home_w + road_w, home_w + home_l + road_w + road_l
+    win_pct = np.divide(wins, gp, out=np.zeros(n), where=gp > 0)
+
+    ratings, hca, _ = margin_ratings(ph, pa, pm, n)
+    met = pair_counts(ph, pa, n)
+    left = pair_counts(home[~played], away[~played], n)
+    remaining = left.sum(axis=1)
+
+    def mean_over(counts, values, total):
+        return np.divide(counts @ values, total, out=np.full(n, np.nan), where=total > 0)
+
+    return pd.DataFrame({
+        "GP": gp, "W": wins, "L": gp - wins, "WinPct": win_pct,
+        "HomeW": home_w, "HomeL": home_l, "HomeDiff": home_diff,
+        "RoadW": road_w, "RoadL": road_l, "RoadDiff": road_diff,
+        "OppWinPct": mean_over(met, win_pct, gp),
+        "Rating": ratings, "SOS": mean_over(met, ratings, gp),
+        "RemainingGames": remaining,
+        "RemainingSOS": mean_over(left, ratings, remaining),
+        "RemainingOppWinPct": mean_over(left, win_pct, remaining),
+    }, index=pd.Index(teams, name="Team")).assign(HomeAdvantage=hca)
+
+
+def margin_model(df):
+    """
+    Win-probability model for simulate_positions built on the margin ratings of df.
+
+    The expected home margin rating[home] - rating[away] + home advantage is
+    turned into a probability with a logistic curve scaled to the spread of the
+    fit's residuals.
+    """
+    teams, home, away, played, margin = schedule_arrays(df)
+    ratings, hca, sigma = margin_ratings(home[played], away[played], margin[played], len(teams))
+    by_team = dict(zip(teams, ratings))
+    # Logistic with the same variance as a normal of standard deviation sigma
+    scale = max(sigma, 1.0) * np.sqrt(3) / np.pi
+
+    def model(state, home, away):
+        rating = np.array([by_team.get(team, 0.0) for team in state.teams])
+        expected = rating[home] - rating[away] + hca
+        return np.clip(1 / (1 + np.exp(-expected / scale)), 0.01, 0.99)
+
+    return model
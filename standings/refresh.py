@@ -0,0 +1,57 @@
+"""Background refresher for shared calendars.
+
+One CalendarRefresher per process holds the latest result of every loader.
+Readers always get the current value without waiting on the network; a daemon
+thread reloads each entry every `interval` seconds and swaps the new value in
+under a lock, so a reader never sees a half-updated calendar.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarRefresher:
+    """Latest value of named loaders, refreshed in a background thread."""
+
+    def __init__(self, loaders, interval=60):
+        self.loaders = dict(loaders)
+        self.interval = interval
+        self.loaded_at = {}
+        self._values = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="calendar-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def get(self, name):
+        """Current value of a loader, loading it synchronously the first time."""
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+        return self.refresh(name)
+
+    def refresh(self, name):
+        value = self.loaders[name]()
+        with self._lock:
+            self._values[name] = value
+            self.loaded_at[name] = time.time()
+        return value
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for name in self.loaders:
+                try:
+                    self.refresh(name)
+                except Exception:
+                    # Keep serving the last good value until the API answers again
+                    logger.exception("Refreshing %s failed", name)
@@ -0,0 +1,230 @@
+"""Compact array-backed season.
+
+A Season keeps the games of one competition season as small NumPy columns
+(int16 team ids and scores, int8 results) with a packed played-mask bitmap
+instead of NaN, plus one team dictionary holding every code and club name
+once. Aggregation and tiebreaking run on the columns directly, so hundreds of
+seasons or scenarios can stay resident.
+"""
+import logging
+
+import numpy as np
+
+from standings import instrument
+from standings.parse import UNPLAYED
+from standings.tiebreak import head_to_head_matrices, name_ranks, rank_teams
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = {
+    "game_code": np.int32, "round": np.int16, "group": np.int8, "local": np.int16, "road": np.int16,
+    "home_score": np.int16, "road_score": np.int16, "home_win": np.int8, "played_bits": np.uint8,
+}
+
+
+class Season:
+    """Games of one competition season as typed columns and a shared team dictionary."""
+
+    __slots__ = (
+        "code", "season", "teams", "names", "team_index", "groups", "sanctioned",
+        "game_code", "round", "group", "local", "road", "home_score", "road_score",
+        "home_win", "played_bits", "n_games",
+    )
+
+    def __init__(self, teams, names, local, road, home_score, road_score, home_win, played,
+                 round, group=None, groups=None, game_code=None, sanctioned_teams=None,
+                 code=None, season=None):
+        n = len(local)
+        self.code = code
+        self.season = season
+        self.teams = list(teams)
+        self.names = list(names)
+        self.team_index = {team: k for k, team in enumerate(self.teams)}
+        self.groups = list(groups or [])
+        self.sanctioned = np.array([team in (sanctioned_teams or ()) for team in self.teams], dtype=bool)
+        self.n_games = n
+        self.local = np.asarray(local, dtype=np.int16)
+        self.road = np.asarray(road, dtype=np.int16)
+        self.home_score = np.asarray(home_score, dtype=np.int16)
+        self.road_score = np.asarray(road_score, dtype=np.int16)
+        self.home_win = np.asarray(home_win, dtype=np.int8)
+        self.played_bits = np.packbits(np.asarray(played, dtype=bool))
+        self.round = np.asarray(round, dtype=np.int16)
+        self.group = np.zeros(n, dtype=np.int8) if group is None else np.asarray(group, dtype=np.int8)
+        self.game_code = np.zeros(n, dtype=np.int32) if game_code is None else np.asarray(game_code, dtype=np.int32)
+
+    @classmethod
+    def from_columns(cls, columns, teams, names, groups=None, sanctioned_teams=None, code=None, season=None):
+        """
+        Season over existing column arrays (e.g. memory-mapped), without copying them.
+
+        Args:
+            columns (dict): one array per name in COLUMNS, with the dtypes given there
+            teams, names (list): team codes and club names by team id
+        """
+        self = cls.__new__(cls)
+        self.code = code
+        self.season = season
+        self.teams = list(teams)
+        self.names = list(names)
+        self.team_index = {team: k for k, team in enumerate(self.teams)}
+        self.groups = list(groups or [])
+        self.sanctioned = np.array([team in (sanctioned_teams or ()) for team in self.teams], dtype=bool)
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+        self.n_games = len(self.local)
+        return self
+
+    def columns(self):
+        """The game column arrays by name."""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    @classmethod
+    def from_parsed(cls, parsed, code=None, season=None):
+        """Season from the columns returned by standings.parse.parse_stream."""
+        played = parsed["home_win"] != UNPLAYED
+        return cls(parsed["teams"], parsed["names"], parsed["local"], parsed["road"],
+                   parsed["home_score"], parsed["road_score"], np.where(played, parsed["home_win"], 0), played,
+                   parsed["round"], parsed["group"], parsed["groups"], parsed["game_code"],
+                   parsed["sanctioned"], code, season)
+
+    @classmethod
+    def from_dataframe(cls, df, sanctioned_teams=None, code=None, season=None):
+        """
+        Season from a classic games DataFrame (Local, Visitor, HomeWin, ...).
+
+        Rows without a local or visitor team code are dropped with a warning,
+        so no game ever points at a team id of -1.
+        """
+        import pandas as pd
+
+        known = df["Local"].notna() & df["Visitor"].notna()
+        if not known.all():
+            logger.warning("Dropping %d games without a team code", (~known).sum())
+            df = df[known]
+        teams = list(pd.unique(df[["Local", "Visitor"]].values.ravel()))
+        names = pd.concat([
+            pd.Series(df["Local_Name"].to_numpy(), index=df["Local"].to_numpy()),
+            pd.Series(df["Visitor_Name"].to_numpy(), index=df["Visitor"].to_numpy()),
+        ])
+        names = names[~names.index.duplicated(keep="last")]
+        index = pd.Index(teams)
+        home_win = df["HomeWin"].to_numpy(dtype=float)
+        played = ~np.isnan(home_win)
+        if "Group" in df.columns:
+            group_codes, groups = pd.factorize(df["Group"])
+        else:
+            group_codes, groups = None, []
+        return cls(teams, [names.get(team, team) for team in teams],
+                   index.get_indexer(df["Local"]), index.get_indexer(df["Visitor"]),
+                   np.nan_to_num(df["HomeScore"].to_numpy(dtype=float)),
+                   np.nan_to_num(df["RoadScore"].to_numpy(dtype=float)),
+                   np.where(played, home_win, 0), played, df["Round"].to_numpy(),
+                   group_codes, list(groups), None, sanctioned_teams, code, season)
+
+    @property
+    def played(self):
+        """Boolean played mask, unpacked from the bitmap."""
+        return np.unpackbits(self.played_bits, count=self.n_games).astype(bool)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the game columns."""
+        return sum(col.nbytes for col in self.columns().values())
+
+    def group_season(self, label):
+        """Season restricted to one group, with its own team dictionary."""
+        rows = self.group == self.groups.index(label)
+        used = np.unique(np.concatenate([self.local[rows], self.road[rows]]))
+        remap = np.full(len(self.teams), -1, dtype=np.int16)
+        remap[used] = np.arange(len(used))
+        return Season([self.teams[k] for k in used], [self.names[k] for k in used],
+                      remap[self.local[rows]], remap[self.road[rows]],
+                      self.home_score[rows], self.road_score[rows], self.home_win[rows],
+                      self.played[rows], self.round[rows], np.zeros(rows.sum()), [label],
+                      self.game_code[rows], [self.teams[k] for k in used if self.sanctioned[k]],
+                      self.code, self.season)
+
+    def round_robin_groups(self):
+        """Groups in which every pair of their (three or more) teams is scheduled to meet, i.e. not play-off rounds."""
+        n = len(self.teams)
+        lo = np.minimum(self.local, self.road).astype(np.int64)
+        hi = np.maximum(self.local, self.road).astype(np.int64)
+        groups = []
+        for g, name in enumerate(self.groups):
+            rows = self.group == g
+            teams = np.unique(np.concatenate([lo[rows], hi[rows]]))
+            pairs = np.unique(lo[rows] * n + hi[rows])
+            if len(teams) >= 3 and len(pairs) == len(teams) * (len(teams) - 1) // 2:
+                groups.append(name)
+        return groups
+
+    @instrument.stage("compute", rows=lambda totals, args: args[0].n_games)
+    def totals(self):
+        """Per-team wins, losses, points for and points against over the played games."""
+        n = len(self.teams)
+        played = self.played
+        home, away = self.local[played], self.road[played]
+        hs = self.home_score[played].astype(np.float64)
+        rs = self.road_score[played].astype(np.float64)
+        home_won = self.home_win[played] == 1
+        wins = np.bincount(home[home_won], minlength=n) + np.bincount(away[~home_won], minlength=n)
+        games = np.bincount(home, minlength=n) + np.bincount(away, minlength=n)
+        pf = np.bincount(home, weights=hs, minlength=n) + np.bincount(away, weights=rs, minlength=n)
+        pa = np.bincount(home, weights=rs, minlength=n) + np.bincount(away, weights=hs, minlength=n)
+        return wins, games - wins, pf, pa
+
+    def head_to_head(self):
+        """(wins, points, games) team-by-team matrices, see head_to_head_matrices."""
+        played = self.played
+        return head_to_head_matrices(self.local, self.road,
+                                     np.where(played, self.home_score, np.nan),
+                                     np.where(played, self.road_score, np.nan),
+                                     np.where(played, self.home_win, np.nan), len(self.teams))
+
+    @instrument.stage("resolve", rows=lambda order, args: args[0].n_games)
+    def ranking(self):
+        """Team ids from first to last with the bylaw tiebreakers."""
+        wins, losses, pf, pa = self.totals()
+        h2h_wins, h2h_points, h2h_games = self.head_to_head()
+        return rank_teams(wins, losses, pf, pa, name_ranks(self.names),
+                          h2h_wins, h2h_points, h2h_games, self.sanctioned)
+
+    def table(self, order=None):
+        """
+        Ranked standings with the same columns as resolve_tiebreakers_with_bylaws.
+
+        order is a ranking() already computed elsewhere, e.g. in a worker process.
+        """
+        import pandas as pd
+
+        wins, losses, pf, pa = self.totals()
+        if order is None:
+            order = self.ranking()
+        games = wins + losses
+        return pd.DataFrame({
+            "Team": [self.teams[k] for k in order],
+            "W": wins[order], "L": losses[order], "PF": pf[order], "PA": pa[order],
+            "Games": games[order], "Sanctioned": self.sanctioned[order],
+            "Diff": (pf - pa)[order], "Total": games[order],
+            "ClubName": [self.names[k] for k in order],
+        })
+
+    def to_dataframe(self):
+        """The classic games DataFrame, for code that still expects it."""
+        import pandas as pd
+
+        teams = np.array(self.teams, dtype=object)
+        names = np.array(self.names, dtype=object)
+        played = self.played
+        hs = np.where(played, self.home_score, np.nan)
+        rs = np.where(played, self.road_score, np.nan)
+        home_win = np.where(played, self.home_win, np.nan)
+        return pd.DataFrame({
+            "Local": teams[self.local], "Visitor": teams[self.road],
+            "Local_Name": names[self.local], "Visitor_Name": names[self.road],
+            "HomeWin": home_win, "RoadWin": np.where(played, 1 - home_win, np.nan),
+            "HomeScore": hs, "RoadScore": rs, "PlusMinus": hs - rs,
+            "Round": self.round.astype(np.int64),
+            "Group": np.array(self.groups, dtype=object)[self.group] if self.groups else None,
+        })
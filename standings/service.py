@@ -0,0 +1,255 @@
+"""Local HTTP service for the current standings.
+
+Every response is precomputed when the results change, not per request: a
+background thread polls the games endpoint through a ResponseCache without
+TTL, and whenever a competition's payload changes it ranks each of its tables
+once and renders every endpoint (JSON and the C;label;... text) into memory
+with its ETag. Requests are then dictionary lookups answered with 200 or, when
+If-None-Match matches, 304. What-if requests reuse a WhatIf built with the
+same snapshot, so they only apply their overrides, and the last results are
+kept in a small LRU.
+
+Endpoints (append .txt / .json or pass ?format=txt|json, JSON by default):
+
+    /                                   available endpoints
+    /standings/el, /standings/ec/<group>
+    /timeline/el, /timeline/ec/<group>  rank after every round (text is CSV)
+    /whatif/el?result=<game code>:<home score>-<road score>  (repeatable)
+"""
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from standings.core import export_groups, group_slug
+from standings.export import render
+from standings.files import digest, file_digest
+from standings.http_cache import DEFAULT_DIR, ResponseCache
+from standings.parse import parse_stream
+from standings.season import Season
+from standings.timeline import season_timeline
+from standings.whatif import WhatIf
+
+logger = logging.getLogger(__name__)
+
+PREFIXES = {"E": "el", "U": "ec"}
+CONTENT_TYPES = {"json": "application/json", "txt": "text/plain; charset=utf-8"}
+WHATIF_CACHE_SIZE = 1024
+
+_ENTITY_TAG = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+
+class Response:
+    """A rendered body with its content type and ETag."""
+
+    __slots__ = ("status", "body", "content_type", "etag")
+
+    def __init__(self, body, fmt="json", status=200):
+        self.status = status
+        self.body = body
+        self.content_type = CONTENT_TYPES[fmt]
+        self.etag = f'"{digest(body)}"'
+
+
+def _error(status, message):
+    return Response(json.dumps({"error": message}).encode("utf-8"), "json", status)
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Whether an If-None-Match header value matches etag.
+
+    The header is a comma-separated list of entity tags or "*"; tags are
+    compared whole with the weak comparison of RFC 9110 (a W/ prefix is ignored).
+    """
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in _ENTITY_TAG.findall(if_none_match):
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+def _parse_result(text):
+    """"12:85-80" -> (12, 85, 80)."""
+    try:
+        game, score = text.split(":")
+        home, road = score.split("-")
+        return int(game), int(home), int(road)
+    except ValueError:
+        raise ValueError(f"Bad result {text!r}, expected <game code>:<home score>-<road score>") from None
+
+
+class StandingsService:
+    """Precomputed standings responses of a set of competitions, refreshed in the background."""
+
+    def __init__(self, competitions, cache=None, interval=30):
+        self.competitions = list(competitions)
+        self.cache = cache or ResponseCache(DEFAULT_DIR, ttl=0)
+        self.interval = interval
+        self._bodies = {}
+        # competition key -> (responses, whatifs) of its last payload
+        self._snapshots = {}
+        # path -> {format: Response}; replaced as a whole so readers never see a partial update
+        self._responses = {}
+        # path -> (WhatIf, label, version)
+        self._whatifs = {}
+        self._whatif_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------------- precompute ----------------
+
+    def refresh(self):
+        """Re-render the competitions whose payload changed; returns their keys."""
+        changed = []
+        for competition in self.competitions:
+            try:
+                if self._refresh(competition):
+                    changed.append(competition.key)
+            except Exception:
+                # Keep serving the last good responses until the API answers again
+                logger.exception("Refreshing %s failed", competition.key)
+        return changed
+
+    def _refresh(self, competition):
+        path = self.cache.fetch(competition.url, competition.key)
+        body = file_digest(path)
+        if self._bodies.get(competition.key) == body:
+            return False
+        with path.open("rb") as stream:
+            parsed = parse_stream(stream, competition.detect_sanctioned)
+        season = Season.from_parsed(parsed, competition.code, competition.season)
+
+        prefix = PREFIXES[competition.code]
+        responses, whatifs = {}, {}
+        with self._lock:
+            self._version += 1
+            version = self._version
+        tables = export_groups(competition, season)
+        for _, label, table_season in tables:
+            name = prefix if len(tables) == 1 and not competition.groups else f"{prefix}/{group_slug(label).lower()}"
+            table = table_season.table()
+            responses[f"/standings/{name}"] = {fmt: Response(render(table, label, fmt), fmt) for fmt in ("json", "txt")}
+            timeline = season_timeline(table_season).long_frame()
+            responses[f"/timeline/{name}"] = {
+                "json": Response(timeline.to_json(orient="records").encode("utf-8"), "json"),
+                "txt": Response(timeline.to_csv(index=False).encode("utf-8"), "txt"),
+            }
+            whatifs[f"/whatif/{name}"] = (WhatIf(table_season), label, version)
+
+        with self._lock:
+            self._snapshots[competition.key] = (responses, whatifs)
+            merged = {}
+            self._whatifs = {}
+            for snapshot_responses, snapshot_whatifs in self._snapshots.values():
+                merged.update(snapshot_responses)
+                self._whatifs.update(snapshot_whatifs)
+            index = {"endpoints": sorted(merged) + sorted(self._whatifs)}
+            merged["/"] = {"json": Response(json.dumps(index).encode("utf-8"), "json")}
+            self._responses = merged
+            self._bodies[competition.key] = body
+        return True
+
+    def start(self):
+        """Load every competition now, then keep refreshing every `interval` seconds in a daemon thread."""
+        self.refresh()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="standings-service", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for key in self.refresh():
+                logger.info("Updated %s", key)
+
+    # ---------------- lookups ----------------
+
+    def response(self, path, query):
+        """The Response for a request path and its parsed query string."""
+        fmt = (query.get("format") or ["json"])[0]
+        for suffix in (".txt", ".json"):
+            if path.endswith(suffix):
+                path, fmt = path[:-len(suffix)], suffix[1:]
+        if fmt not in CONTENT_TYPES:
+            return _error(400, f"Unknown format {fmt!r}, expected json or txt")
+        path = path.rstrip("/") or "/"
+
+        if path.startswith("/whatif/"):
+            return self._whatif(path, query.get("result", []), fmt)
+        variants = self._responses.get(path)
+        if variants is None:
+            return _error(404, f"No such endpoint: {path}")
+        return variants.get(fmt) or variants["json"]
+
+    def _whatif(self, path, results, fmt):
+        entry = self._whatifs.get(path)
+        if entry is None:
+            return _error(404, f"No such endpoint: {path}")
+        whatif, label, version = entry
+        try:
+            overrides = tuple(sorted(_parse_result(r) for r in results))
+        except ValueError as exc:
+            return _error(400, str(exc))
+
+        key = (path, version, overrides, fmt)
+        with self._lock:
+            cached = self._whatif_cache.get(key)
+            if cached is not None:
+                self._whatif_cache.move_to_end(key)
+                return cached
+        try:
+            table = whatif.rank([list(overrides)]).table(0)
+        except KeyError as exc:
+            return _error(400, f"Unknown game code {exc.args[0]}")
+        response = Response(render(table, label, fmt), fmt)
+        with self._lock:
+            self._whatif_cache[key] = response
+            if len(self._whatif_cache) > WHATIF_CACHE_SIZE:
+                self._whatif_cache.popitem(last=False)
+        return response
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "standings"
+    # Headers and body go out in separate writes; without this keep-alive clients wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug("%s " + format, self.address_string(), *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        response = self.server.service.response(url.path, parse_qs(url.query))
+        if response.status == 200 and etag_matches(self.headers.get("If-None-Match"), response.etag):
+            self.send_response(304)
+            self.send_header("ETag", response.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(response.body)
+
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """ThreadingHTTPServer answering from service; call serve_forever() on it."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
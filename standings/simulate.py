@@ -0,0 +1,172 @@
+"""Monte Carlo playoff odds.
+
+Every unplayed game of a calendar (HomeWin is NaN) is filled N times from a
+win-probability model, each scenario is ranked with the bylaw tiebreakers and
+the finishing positions are counted. Scenarios are generated in batches with
+NumPy, and batches can be spread over a process pool.
+
+Ranking is vectorized over the batch: every scenario is sorted by the overall
+criteria at once, ties of two teams on wins are settled with array operations
+on their head-to-head games (or the general criteria), and only groups of
+three or more teams level on wins go through resolve_group one by one.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from standings.state import StandingsState
+from standings.tiebreak import fallback_order, resolve_group
+
+
+def coin_flip_model(state, home, away):
+    """Every remaining game is a 50/50."""
+    return np.full(len(home), 0.5)
+
+
+def win_pct_model(state, home, away, home_advantage=0.1):
+    """Log5 on smoothed win percentages, shifted in favour of the home team."""
+    pct = (state.wins + 1) / (state.wins + state.losses + 2)
+    ph, pa = pct[home], pct[away]
+    p = ph * (1 - pa) / (ph * (1 - pa) + pa * (1 - ph))
+    return np.clip(p + home_advantage / 2, 0.01, 0.99)
+
+
+def _base_arrays(state):
+    return (state.wins, state.losses, state.pf, state.pa, state.name_rank,
+            state.h2h_wins, state.h2h_points, state.h2h_games, state.sanctioned)
+
+
+def _simulate_batch(base, home, away, p_home, loser_points, n_sims, seed):
+    """Position counts (team x position) of n_sims scenarios; runs inside the workers."""
+    wins, losses, pf, pa, name_rank, h2h_wins, h2h_points, h2h_games, sanctioned = base
+    n_teams, n_games = len(wins), len(home)
+    rng = np.random.default_rng(seed)
+
+    home_won = rng.random((n_sims, n_games)) < p_home
+    margin = 1 + rng.geometric(0.1, size=(n_sims, n_games))
+    hs = np.where(home_won, loser_points + margin, loser_points)
+    rs = np.where(home_won, loser_points, loser_points + margin)
+
+    # Team x game incidence matrices turn the per-game arrays into per-team totals
+    home_inc = np.zeros((n_games, n_teams))
+    away_inc = np.zeros((n_games, n_teams))
+    home_inc[np.arange(n_games), home] = 1
+    away_inc[np.arange(n_games), away] = 1
+    sim_wins = wins + home_won @ home_inc + (~home_won) @ away_inc
+    sim_losses = losses + (~home_won) @ home_inc + home_won @ away_inc
+    sim_pf = pf + hs @ home_inc + rs @ away_inc
+    sim_pa = pa + rs @ home_inc + hs @ away_inc
+
+    # Head-to-head matrices of every scenario at once, as flat (scenario, row, column) bins
+    cells = n_teams * n_teams
+    offset = (np.arange(n_sims) * cells)[:, None]
+    winner = np.where(home_won, home, away)
+    loser = np.where(home_won, away, home)
+    sim_h2h_wins = np.bincount((offset + winner * n_teams + loser).ravel(), minlength=n_sims * cells)
+    sim_h2h_points = (np.bincount((offset + home * n_teams + away).ravel(), weights=hs.ravel(), minlength=n_sims * cells)
+                      + np.bincount((offset + away * n_teams + home).ravel(), weights=rs.ravel(), minlength=n_sims * cells))
+    sim_h2h_wins = sim_h2h_wins.reshape(n_sims, n_teams, n_teams) + h2h_wins
+    sim_h2h_points = sim_h2h_points.reshape(n_sims, n_teams, n_teams) + h2h_points
+
+    order = _rank_batch(sim_wins, sim_losses, sim_pf, sim_pa, name_rank, sim_h2h_wins, sim_h2h_points,
+                        h2h_games, sanctioned)
+    positions = np.broadcast_to(np.arange(n_teams), order.shape)
+    return np.bincount((order * n_teams + positions).ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+
+def _rank_batch(wins, losses, pf, pa, name_rank, h2h_wins, h2h_points, h2h_games, sanctioned):
+    """rank_teams of every scenario (rows of the per-team arrays), as a (scenarios x teams) id array."""
+    n_sims, n_teams = wins.shape
+    diff = pf - pa
+    order = np.lexsort((np.broadcast_to(name_rank, wins.shape), -pf, -diff, losses, -wins))
+    level = np.diff(np.take_along_axis(wins, order, axis=1), axis=1) == 0
+
+    # Runs of teams level on wins: start position and length of every run in every scenario
+    starts = np.ones((n_sims, n_teams), dtype=bool)
+    starts[:, 1:] = ~level
+    s, start = np.nonzero(starts)
+    length = np.diff(np.append(s * n_teams + start, n_sims * n_teams))
+
+    # Three or more teams level: the recursive head-to-head rule, group by group
+    games = wins + losses
+    for s_, start_, length_ in zip(*(x[length >= 3].tolist() for x in (s, start, length))):
+        def fallback(group):
+            return fallback_order(group, games[s_], pf[s_], pa[s_], name_rank, sanctioned)
+
+        order[s_, start_:start_ + length_] = resolve_group(
+            order[s_, start_:start_ + length_], h2h_wins[s_], h2h_points[s_], h2h_games, fallback)
+
+    # Two teams level: head-to-head wins, then head-to-head difference, else the general criteria
+    pair = length == 2
+    s, k = s[pair], start[pair]
+    a, b = order[s, k], order[s, k + 1]
+    wins_ab = h2h_wins[s, a, b] - h2h_wins[s, b, a]
+    points_ab = h2h_points[s, a, b] - h2h_points[s, b, a]
+    by_h2h = (h2h_games[a, b] >= 2) & ((wins_ab != 0) | (points_ab != 0))
+    swap = np.where(wins_ab != 0, wins_ab < 0, points_ab < 0)
+
+    decided = by_h2h.copy()
+    for key in (sanctioned.astype(np.int64), -games, -diff, -pf, name_rank):
+        key_a = key[a] if key.ndim == 1 else key[s, a]
+        key_b = key[b] if key.ndim == 1 else key[s, b]
+        split = ~decided & (key_a != key_b)
+        swap[split] = key_b[split] < key_a[split]
+        decided |= split
+    swap &= decided
+
+    order[s[swap], k[swap]] = b[swap]
+    order[s[swap], k[swap] + 1] = a[swap]
+    return order
+
+
+def simulate_positions(df, n_sims=100_000, model=win_pct_model, sanctioned_teams=None,
+                       seed=None, batch_size=5_000, processes=None):
+    """
+    Probability of every team finishing at every position.
+
+    Args:
+        df (pd.DataFrame): calendar as returned by actual_calendar() or eurocup_calendar_2025()
+        n_sims (int): number of simulated seasons
+        model (callable): model(state, home_ids, away_ids) -> home win probability per game
+        sanctioned_teams (list): team codes ranked last among equals
+        seed (int): seed for reproducible runs
+        batch_size (int): scenarios generated per batch
+        processes (int): worker processes; 1 runs in the current process, None uses every core
+    Returns:
+        pd.DataFrame: one row per team, one column per position (1 = first)
+    """
+    if n_sims <= 0:
+        raise ValueError(f"n_sims must be positive, got {n_sims}")
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    state = StandingsState.from_calendar(df, sanctioned_teams)
+    remaining = df[df["HomeWin"].isna()]
+    remaining = remaining[remaining["Local"].isin(state.index) & remaining["Visitor"].isin(state.index)]
+    home = remaining["Local"].map(state.index).to_numpy(dtype=np.int64)
+    away = remaining["Visitor"].map(state.index).to_numpy(dtype=np.int64)
+    p_home = np.asarray(model(state, home, away), dtype=np.float64)
+
+    played = df[df["HomeWin"].notna()]
+    loser_points = float(np.minimum(played["HomeScore"], played["RoadScore"]).mean()) if len(played) else 75.0
+    loser_points = round(loser_points)
+
+    sizes = [batch_size] * (n_sims // batch_size)
+    if n_sims % batch_size:
+        sizes.append(n_sims % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    base = _base_arrays(state)
+    jobs = [(base, home, away, p_home, loser_points, size, s) for size, s in zip(sizes, seeds)]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1 or len(jobs) == 1:
+        results = [_simulate_batch(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_simulate_batch, *zip(*jobs)))
+
+    counts = np.sum(results, axis=0)
+    return pd.DataFrame(counts / n_sims, index=pd.Index(state.teams, name="Team"),
+                        columns=range(1, len(state.teams) + 1))
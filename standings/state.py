@@ -0,0 +1,143 @@
+"""Incremental standings for live results.
+
+StandingsState is built once from the calendar DataFrame returned by
+actual_calendar() / eurocup_calendar_2025() and then kept up to date one game
+at a time, instead of recomputing the whole table for every edited result.
+"""
+import numpy as np
+import pandas as pd
+
+from standings.tiebreak import head_to_head_matrices, name_ranks, rank_teams
+
+
+class StandingsState:
+    """Per-team totals and head-to-head matrix of one season, updated in place."""
+
+    def __init__(self, teams, names, sanctioned_teams=None):
+        self.teams = list(teams)
+        self.names = list(names)
+        self.index = {team: k for k, team in enumerate(self.teams)}
+        self.sanctioned = np.array([team in (sanctioned_teams or []) for team in self.teams], dtype=bool)
+        self.name_rank = name_ranks(self.names)
+
+        n = len(self.teams)
+        self.wins = np.zeros(n, dtype=np.int64)
+        self.losses = np.zeros(n, dtype=np.int64)
+        self.pf = np.zeros(n, dtype=np.float64)
+        self.pa = np.zeros(n, dtype=np.float64)
+        self.h2h_wins = np.zeros((n, n), dtype=np.int64)
+        self.h2h_points = np.zeros((n, n), dtype=np.float64)
+        self.h2h_games = np.zeros((n, n), dtype=np.int64)
+
+        # (round, local, visitor) -> (home score, road score) of every applied result
+        self.results = {}
+        self._fixtures = set()
+        self._group_cache = {}
+
+    @classmethod
+    def from_calendar(cls, df, sanctioned_teams=None):
+        """Build the state from a calendar DataFrame, applying every played game."""
+        names = {}
+        for side in ("Local", "Visitor"):
+            codes = df[side].to_numpy()
+            club_names = df[f"{side}_Name"].to_numpy()
+            for code, name in zip(codes, club_names):
+                if not pd.isna(code):
+                    names[code] = name
+        teams = pd.unique(df[["Local", "Visitor"]].values.ravel())
+        teams = [team for team in teams if not pd.isna(team)]
+        state = cls(teams, [names.get(team, team) for team in teams], sanctioned_teams)
+
+        rounds = df["Round"].to_numpy()
+        local = df["Local"].to_numpy()
+        visitor = df["Visitor"].to_numpy()
+        home = pd.Index(teams).get_indexer(local)
+        away = pd.Index(teams).get_indexer(visitor)
+        hs = df["HomeScore"].to_numpy(dtype=float)
+        rs = df["RoadScore"].to_numpy(dtype=float)
+        home_win = df["HomeWin"].to_numpy(dtype=float)
+
+        # Whole-season totals in one pass; later results go through apply_result
+        state.h2h_wins, state.h2h_points, state.h2h_games = head_to_head_matrices(
+            home, away, hs, rs, home_win, len(teams))
+        state.wins = state.h2h_wins.sum(axis=1)
+        state.losses = state.h2h_wins.sum(axis=0)
+        state.pf = state.h2h_points.sum(axis=1)
+        state.pa = state.h2h_points.sum(axis=0)
+
+        known = (home >= 0) & (away >= 0)
+        state._fixtures = set(zip(rounds[known], local[known], visitor[known]))
+        played = known & ~np.isnan(home_win)
+        state.results = {(rounds[k], local[k], visitor[k]): (hs[k], rs[k]) for k in np.flatnonzero(played)}
+        return state
+
+    def add_fixture(self, round, local, visitor):
+        """Register a scheduled game; the head-to-head rule needs to know every pairing."""
+        key = (round, local, visitor)
+        if key in self._fixtures or local not in self.index or visitor not in self.index:
+            return
+        self._fixtures.add(key)
+        h, a = self.index[local], self.index[visitor]
+        self.h2h_games[h, a] += 1
+        self.h2h_games[a, h] += 1
+        self._invalidate(h, a)
+
+    def apply_result(self, round, local, visitor, hs, rs):
+        """Record the final score of a game, replacing any result already stored for it."""
+        key = (round, local, visitor)
+        if key not in self._fixtures:
+            raise KeyError(f"Unknown game: round {round}, {local} vs {visitor}")
+        if hs == rs:
+            raise ValueError(f"A game cannot end tied: {local} {hs}-{rs} {visitor}")
+        if key in self.results:
+            self.revert_result(round, local, visitor)
+
+        self._update(self.index[local], self.index[visitor], hs, rs, 1)
+        self.results[key] = (hs, rs)
+
+    def revert_result(self, round, local, visitor):
+        """Remove the stored result of a game, making it unplayed again."""
+        hs, rs = self.results.pop((round, local, visitor))
+        self._update(self.index[local], self.index[visitor], hs, rs, -1)
+
+    def _update(self, h, a, hs, rs, sign):
+        winner, loser = (h, a) if hs > rs else (a, h)
+        self.wins[winner] += sign
+        self.losses[loser] += sign
+        self.pf[h] += sign * hs
+        self.pa[h] += sign * rs
+        self.pf[a] += sign * rs
+        self.pa[a] += sign * hs
+        self.h2h_wins[winner, loser] += sign
+        self.h2h_points[h, a] += sign * hs
+        self.h2h_points[a, h] += sign * rs
+        self._invalidate(h, a)
+
+    def _invalidate(self, *team_ids):
+        # Only tie groups containing one of the changed teams need to be resolved again
+        stale = [key for key in self._group_cache if any(t in key for t in team_ids)]
+        for key in stale:
+            del self._group_cache[key]
+
+    def order(self):
+        """Team ids from first to last, re-resolving only the tie groups that changed."""
+        return rank_teams(self.wins, self.losses, self.pf, self.pa, self.name_rank,
+                          self.h2h_wins, self.h2h_points, self.h2h_games,
+                          self.sanctioned, cache=self._group_cache)
+
+    def ranking(self):
+        """Team codes from first to last."""
+        return [self.teams[k] for k in self.order()]
+
+    def table(self):
+        """Ranked standings with the same columns as resolve_tiebreakers_with_bylaws."""
+        order = self.order()
+        games = self.wins + self.losses
+        return pd.DataFrame({
+            "Team": [self.teams[k] for k in order],
+            "W": self.wins[order], "L": self.losses[order],
+            "PF": self.pf[order], "PA": self.pa[order],
+            "Games": games[order], "Sanctioned": self.sanctioned[order],
+            "Diff": (self.pf - self.pa)[order], "Total": games[order],
+            "ClubName": [self.names[k] for k in order],
+        })
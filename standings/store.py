@@ -0,0 +1,178 @@
+"""Local columnar store of parsed seasons.
+
+Each (competition, season) partition is a directory holding versions of the
+season: every version is a directory of .npy files, one per Season column,
+plus a meta.json with the team dictionary, and a CURRENT file names the live
+one. Partitions are memory-mapped on load, so standings can be computed from
+disk without a network call.
+
+A write fills a new version directory and then replaces CURRENT with a single
+rename, so readers see either the old version or the new one and the
+partition never disappears in between. Versions are never modified, so a
+load reads one consistent version; the previous one is kept until the next
+write, and a load that still loses its version to back-to-back writes reads
+CURRENT again. Version names start with their creation time, so a write only
+removes versions older than the one it replaced, and only once they are old
+enough that no concurrent writer can still be filling them.
+Partitions written before versioning (files directly in the partition
+directory) are still read, and are converted on their next write.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from standings.files import UMASK, atomic_write
+from standings.season import COLUMNS, Season
+
+DEFAULT_ROOT = Path(os.environ.get("STANDINGS_STORE_DIR", Path.home() / ".local" / "share" / "standings"))
+# Seconds after which an unpublished version can no longer belong to a running write
+STALE_AFTER = 60
+
+
+def _created_ns(version):
+    """Creation time encoded in a version name (0 for names from before it was encoded)."""
+    try:
+        return int(version.name[1:].split("-", 1)[0])
+    except ValueError:
+        return 0
+
+
+class GameStore:
+    """Seasons partitioned as ROOT/<competition code>/<season>/<column>.npy."""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = Path(root)
+
+    def path(self, code, season):
+        return self.root / code / str(season)
+
+    def current(self, code, season):
+        """Directory of the live version of a partition."""
+        path = self.path(code, season)
+        try:
+            return path / (path / "CURRENT").read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return path
+
+    def meta_path(self, code, season):
+        """meta.json of the live version; its mtime changes on every write."""
+        return self.current(code, season) / "meta.json"
+
+    def partitions(self):
+        """Stored (code, season) pairs, sorted."""
+        if not self.root.exists():
+            return []
+        return sorted((d.parent.name, int(d.name)) for d in self.root.glob("*/*")
+                      if (d / "CURRENT").exists() or (d / "meta.json").exists())
+
+    def __contains__(self, key):
+        return self.meta_path(*key).exists()
+
+    def load(self, code, season, mmap=True):
+        """Stored Season, with its columns memory-mapped read-only unless mmap is False."""
+        path = self.current(code, season)
+        while True:
+            try:
+                meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+                columns = {name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None) for name in COLUMNS}
+                break
+            except FileNotFoundError:
+                # Versions are never modified, only removed: a write replaced this one while it was being read
+                latest = self.current(code, season)
+                if latest == path:
+                    raise
+                path = latest
+        return Season.from_columns(columns, meta["teams"], meta["names"], meta["groups"],
+                                   meta["sanctioned"], code, season)
+
+    def write(self, season):
+        """Store a Season as a new version of its partition and switch CURRENT to it atomically."""
+        partition = self.path(season.code, season.season)
+        partition.mkdir(parents=True, exist_ok=True)
+        version = Path(tempfile.mkdtemp(dir=partition, prefix=f"v{time.time_ns():020d}-"))
+        os.chmod(version, 0o777 & ~UMASK)  # mkdtemp leaves 0700
+        for name, col in season.columns().items():
+            np.save(version / f"{name}.npy", np.ascontiguousarray(col, dtype=COLUMNS[name]))
+        meta = {
+            "teams": season.teams, "names": season.names, "groups": season.groups,
+            "sanctioned": [team for team, flag in zip(season.teams, season.sanctioned) if flag],
+        }
+        atomic_write(version / "meta.json", json.dumps(meta).encode("utf-8"))
+
+        previous = self.current(season.code, season.season)
+        atomic_write(partition / "CURRENT", version.name.encode("utf-8"))
+
+        # Keep the version readers may still be opening and any a concurrent write may still be
+        # filling or about to publish; drop the stale ones older than the version just replaced
+        stale = time.time_ns() - STALE_AFTER * 10**9
+        for entry in partition.iterdir():
+            if entry.is_dir():
+                if entry not in (version, previous) and _created_ns(entry) < min(_created_ns(previous), stale):
+                    shutil.rmtree(entry, ignore_errors=True)
+            elif previous == partition and entry.suffix in (".npy", ".json"):
+                entry.unlink(missing_ok=True)
+        return partition
+
+    def upsert(self, season):
+        """
+        Merge a freshly fetched Season into the stored partition.
+
+        Games are matched on the API game code (or round, local, visitor when it is
+        missing); matched rows take the new result, unknown games are appended and
+        new teams are added to the stored team dictionary. Teams in the fresh
+        Season take its sanction flags, so a lifted sanction is cleared; teams
+        missing from it keep the stored flag.
+        """
+        if (season.code, season.season) not in self:
+            return self.write(season)
+        stored = self.load(season.code, season.season, mmap=False)
+
+        teams, names = list(stored.teams), list(stored.names)
+        index = dict(stored.team_index)
+        for code, name in zip(season.teams, season.names):
+            if code not in index:
+                index[code] = len(teams)
+                teams.append(code)
+                names.append(name)
+        team_map = np.array([index[code] for code in season.teams], dtype=np.int16)
+        groups = list(stored.groups)
+        for group in season.groups:
+            if group not in groups:
+                groups.append(group)
+        group_map = np.array([groups.index(g) for g in season.groups] or [0], dtype=np.int8)
+
+        new = {
+            "game_code": season.game_code, "round": season.round, "group": group_map[season.group],
+            "local": team_map[season.local], "road": team_map[season.road],
+            "home_score": season.home_score, "road_score": season.road_score,
+            "home_win": season.home_win, "played": season.played,
+        }
+        old = {name: getattr(stored, name) for name in COLUMNS if name != "played_bits"}
+        old["played"] = stored.played
+
+        positions = {key: k for k, key in enumerate(_game_keys(old))}
+        rows = np.array([positions.get(key, -1) for key in _game_keys(new)], dtype=np.int64)
+        merged = {}
+        for name, col in old.items():
+            col = col.copy()
+            col[rows[rows >= 0]] = new[name][rows >= 0]
+            merged[name] = np.concatenate([col, new[name][rows < 0]])
+
+        sanctioned = set(teams[k] for k in np.flatnonzero(stored.sanctioned)) - set(season.teams)
+        sanctioned.update(code for code, flag in zip(season.teams, season.sanctioned) if flag)
+        return self.write(Season(teams, names, merged["local"], merged["road"],
+                                 merged["home_score"], merged["road_score"], merged["home_win"],
+                                 merged["played"], merged["round"], merged["group"], groups,
+                                 merged["game_code"], sanctioned, season.code, season.season))
+
+
+def _game_keys(columns):
+    return [
+        ("code", int(code)) if code else ("fixture", int(rnd), int(home), int(away))
+        for code, rnd, home, away in zip(columns["game_code"], columns["round"], columns["local"], columns["road"])
+    ]
@@ -0,0 +1,150 @@
+"""Synthetic seasons for benchmarks and experiments.
+
+synthetic_payload builds a games payload shaped like the API response, so the
+parsers, the DataFrame path and the Season path can all be exercised on
+leagues of any size: one double round-robin or several round-robin groups,
+any fraction of games played, a controllable amount of ties in wins and a
+number of 20-0 forfeits.
+
+Results follow strength tiers. With tie_rate the probability that a team
+shares the tier of the previous one, and no upsets, tied teams split their
+head-to-head games and end a fully played season with the same wins, which is
+exactly what the bylaw tiebreakers have to resolve.
+"""
+import numpy as np
+
+
+def round_robin(n_teams, legs=2):
+    """
+    Schedule of a round-robin with the circle method (odd sizes get a bye).
+
+    Returns:
+        tuple: round (1-based), home and away team index arrays
+    """
+    ids = list(range(n_teams)) + ([-1] if n_teams % 2 else [])
+    m = len(ids)
+    rounds, home, away = [], [], []
+    rnd = 0
+    for leg in range(legs):
+        arr = ids[:]
+        for _ in range(m - 1):
+            rnd += 1
+            for k in range(m // 2):
+                a, b = arr[k], arr[m - 1 - k]
+                if a < 0 or b < 0:
+                    continue
+                if (leg + rnd) % 2:
+                    a, b = b, a
+                rounds.append(rnd)
+                home.append(a)
+                away.append(b)
+            arr = [arr[0], arr[-1]] + arr[1:-1]
+    return np.array(rounds, dtype=np.int64), np.array(home, dtype=np.int64), np.array(away, dtype=np.int64)
+
+
+def group_name(k, n_groups):
+    if n_groups == 1:
+        return "Regular Season"
+    return chr(ord("A") + k) if k < 26 else f"G{k + 1}"
+
+
+def synthetic_payload(n_teams=18, groups=1, played=1.0, tie_rate=0.3, upset_rate=0.2, forfeits=0, seed=0):
+    """
+    Games payload of a synthetic season, in the API response format.
+
+    Args:
+        n_teams (int): number of teams, split evenly between the groups
+        groups (int): 1 for a single double round-robin, more for a group format
+        played (float): fraction of the games already played, in round order
+        tie_rate (float): probability that a team shares the strength tier of the previous one
+        upset_rate (float): probability that the weaker team wins a game
+        forfeits (int): played games turned into 20-0 forfeits (the loser is sanctioned)
+        seed (int): seed of the random generator
+    Returns:
+        dict: {"data": [game, ...]} sorted by round
+    """
+    rng = np.random.default_rng(seed)
+    width = len(str(n_teams - 1))
+    codes = [f"T{k:0{width}d}" for k in range(n_teams)]
+
+    # Strength tiers, shuffled so team codes say nothing about strength
+    new_tier = rng.random(n_teams) >= tie_rate
+    new_tier[0] = True
+    tier = rng.permutation(np.cumsum(new_tier))
+
+    rounds, home, away, group = [], [], [], []
+    for g, members in enumerate(np.array_split(np.arange(n_teams), groups)):
+        r, h, a = round_robin(len(members))
+        rounds.append(r)
+        home.append(members[h])
+        away.append(members[a])
+        group.append(np.full(len(r), g))
+    rounds, home, away, group = (np.concatenate(x) for x in (rounds, home, away, group))
+    order = np.lexsort((group, rounds))
+    rounds, home, away, group = rounds[order], home[order], away[order], group[order]
+    n_games = len(rounds)
+
+    is_played = np.arange(n_games) < round(played * n_games)
+    # Equal tiers: home team wins, so the two legs split
+    home_won = tier[home] <= tier[away]
+    home_won ^= rng.random(n_games) < upset_rate
+    loser = rng.integers(60, 90, n_games)
+    winner = loser + rng.integers(1, 25, n_games)
+    hs = np.where(home_won, winner, loser)
+    rs = np.where(home_won, loser, winner)
+
+    forfeit = np.zeros(n_games, dtype=bool)
+    candidates = np.flatnonzero(is_played)
+    forfeit[rng.choice(candidates, size=min(forfeits, len(candidates)), replace=False)] = True
+    hs = np.where(forfeit, np.where(home_won, 20, 0), hs)
+    rs = np.where(forfeit, np.where(home_won, 0, 20), rs)
+    hs = np.where(is_played, hs, 0)
+    rs = np.where(is_played, rs, 0)
+
+    names = [group_name(g, groups) for g in range(groups)]
+    data = [
+        {
+            "gameCode": k + 1,
+            "round": int(rounds[k]),
+            "group": {"rawName": names[group[k]]},
+            "played": bool(is_played[k]),
+            "local": {"club": {"code": codes[home[k]], "name": f"Club {codes[home[k]]}"},
+                      "score": int(hs[k]), "standingsScore": int(hs[k])},
+            "road": {"club": {"code": codes[away[k]], "name": f"Club {codes[away[k]]}"},
+                     "score": int(rs[k]), "standingsScore": int(rs[k])},
+        }
+        for k in range(n_games)
+    ]
+    return {"data": data}
+
+
+def synthetic_calendar(**kwargs):
+    """(games DataFrame, sanctioned team codes) of a synthetic_payload, like actual_calendar()."""
+    from standings.core import parse_games
+
+    return parse_games(synthetic_payload(**kwargs)["data"], detect_sanctioned=True)
+
+
+def synthetic_season(**kwargs):
+    """Season of a synthetic_payload."""
+    from standings.parse import parse_items
+    from standings.season import Season
+
+    return Season.from_parsed(parse_items(synthetic_payload(**kwargs)["data"], detect_sanctioned=True))
+
+
+def synthetic_scenarios(season, n_scenarios, overrides=4, seed=0):
+    """
+    Random what-if scenarios over the unplayed games of a season.
+
+    Returns:
+        list: one list of (game code, home score, road score) per scenario
+    """
+    rng = np.random.default_rng(seed)
+    games = season.game_code[~season.played]
+    if len(games) == 0:
+        games = season.game_code
+    picks = rng.choice(games, size=(n_scenarios, min(overrides, len(games))))
+    scores = rng.integers(60, 100, size=picks.shape + (2,))
+    scores[..., 0] += scores[..., 0] == scores[..., 1]
+    return [list(zip(p.tolist(), s[:, 0].tolist(), s[:, 1].tolist())) for p, s in zip(picks, scores)]
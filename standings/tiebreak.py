@@ -0,0 +1,167 @@
+"""Tiebreak ranking over integer team ids.
+
+Teams are ordered by wins. Each group of teams level on wins is resolved with
+its head-to-head mini-table when every pair in the group has met at least
+twice: the first criterion (wins, then point difference, then points for)
+that separates the group splits it, and every subset still tied is resolved
+again from the start with only its own games, as the bylaws require. Groups
+the head-to-head games cannot split fall back to the general criteria
+(sanctioned, games, difference, points for, club name).
+
+The head-to-head data of a season lives in three team-by-team matrices built
+once by head_to_head_matrices, so every mini-table is a slice of them.
+"""
+import numpy as np
+
+
+def head_to_head_matrices(home, away, home_score, road_score, home_win, n_teams):
+    """
+    Team-by-team head-to-head matrices of a season.
+
+    Args:
+        home, away (np.ndarray): team ids of every game, -1 for unknown teams
+        home_score, road_score (np.ndarray): final scores, NaN if unplayed
+        home_win (np.ndarray): 1 / 0 for played games, NaN if unplayed
+        n_teams (int): number of team ids
+    Returns:
+        tuple: (wins, points, games) where wins[i, j] are wins of i against j,
+        points[i, j] points scored by i against j and games[i, j] the number of
+        scheduled games between i and j
+    """
+    home = np.asarray(home, dtype=np.int64)
+    away = np.asarray(away, dtype=np.int64)
+    home_win = np.asarray(home_win, dtype=np.float64)
+    known = (home >= 0) & (away >= 0)
+    home, away, home_win = home[known], away[known], home_win[known]
+    hs = np.asarray(home_score, dtype=np.float64)[known]
+    rs = np.asarray(road_score, dtype=np.float64)[known]
+    cells = n_teams * n_teams
+
+    games = np.bincount(home * n_teams + away, minlength=cells).reshape(n_teams, n_teams)
+    games = games + games.T
+
+    played = ~np.isnan(home_win)
+    home, away, hs, rs = home[played], away[played], hs[played], rs[played]
+    won = home_win[played] == 1
+    winner, loser = np.where(won, home, away), np.where(won, away, home)
+    wins = np.bincount(winner * n_teams + loser, minlength=cells).reshape(n_teams, n_teams)
+    points = (np.bincount(home * n_teams + away, weights=hs, minlength=cells)
+              + np.bincount(away * n_teams + home, weights=rs, minlength=cells)).reshape(n_teams, n_teams)
+    return wins, points, games
+
+
+def mini_table(group, h2h_wins, h2h_points):
+    """Head-to-head wins, points for and points against of a group, among its own games only."""
+    rows, cols = group[:, None], group
+    points = h2h_points[rows, cols]
+    return h2h_wins[rows, cols].sum(axis=1), points.sum(axis=1), points.sum(axis=0)
+
+
+def name_ranks(names):
+    """Case-insensitive alphabetical rank of every club name, used as last criterion."""
+    lower = np.array([str(n).lower() for n in names])
+    ranks = np.empty(len(lower), dtype=np.int64)
+    ranks[np.argsort(lower, kind="stable")] = np.arange(len(lower))
+    return ranks
+
+
+def overall_order(wins, losses, pf, pa, name_rank):
+    """Team ids sorted by W, L, Diff, PF and club name, as the scripts' sort_values."""
+    return np.lexsort((name_rank, -pf, -(pf - pa), losses, -wins))
+
+
+def tie_groups(order, wins):
+    """Split an ordered id array into runs of teams with the same number of wins."""
+    cuts = np.flatnonzero(np.diff(wins[order])) + 1
+    return np.split(order, cuts)
+
+
+def head_to_head_applies(group, h2h_games):
+    """True when every pair of the group has been scheduled to meet at least twice."""
+    # The diagonal is always 0, so any other count below 2 is a missing pairing
+    return np.count_nonzero(h2h_games[group[:, None], group] < 2) == len(group)
+
+
+def resolve_group(group, h2h_wins, h2h_points, h2h_games, fallback, record=None):
+    """
+    Order a group of teams level on wins, recursing into the subsets the mini-table leaves tied.
+
+    Args:
+        group (np.ndarray): tied team ids, in overall order
+        h2h_wins, h2h_points, h2h_games (np.ndarray): season head-to-head matrices
+        fallback (callable): fallback(group) -> group ordered by the general criteria
+        record (dict): optional, filled with {team id: "h2h" or "fallback"}, the criteria
+            that fixed the place of each team
+    Returns:
+        np.ndarray: the group from first to last
+    """
+    if len(group) == 1:
+        return group
+    if not head_to_head_applies(group, h2h_games):
+        if record is not None:
+            record.update(dict.fromkeys(group.tolist(), "fallback"))
+        return fallback(group)
+
+    w, pf, pa = mini_table(group, h2h_wins, h2h_points)
+    for key in (w, pf - pa, pf):
+        if (key == key[0]).all():
+            continue
+        # First separating criterion: split by it and restart inside each still-tied subset
+        order = np.argsort(-key, kind="stable")
+        group, key = group[order], key[order]
+        cuts = np.flatnonzero(np.diff(key)) + 1
+        if record is not None:
+            record.update(dict.fromkeys(group.tolist(), "h2h"))
+        if len(cuts) == len(group) - 1:
+            return group
+        return np.concatenate([resolve_group(sub, h2h_wins, h2h_points, h2h_games, fallback, record)
+                               for sub in np.split(group, cuts)])
+    if record is not None:
+        record.update(dict.fromkeys(group.tolist(), "fallback"))
+    return fallback(group)
+
+
+def fallback_order(group, games, pf, pa, name_rank, sanctioned):
+    """Order a tied group by sanctioned, games, difference, points for and club name."""
+    return group[np.lexsort((name_rank[group], -pf[group], -(pf - pa)[group], -games[group], sanctioned[group]))]
+
+
+def rank_teams(wins, losses, pf, pa, name_rank, h2h_wins, h2h_points, h2h_games, sanctioned=None, cache=None):
+    """
+    Final ranking of all teams as an array of team ids.
+
+    Args:
+        wins, losses, pf, pa (np.ndarray): per-team totals indexed by team id
+        name_rank (np.ndarray): output of name_ranks for the same ids
+        h2h_wins (np.ndarray): T x T, wins of row team against column team
+        h2h_points (np.ndarray): T x T, points scored by row team against column team
+        h2h_games (np.ndarray): T x T, scheduled games between both teams
+        sanctioned (np.ndarray): boolean mask of sanctioned teams
+        cache (dict): optional {sorted member ids: resolved order} reused between calls
+    Returns:
+        np.ndarray: team ids from first to last
+    """
+    if sanctioned is None:
+        sanctioned = np.zeros(len(wins), dtype=bool)
+    games = wins + losses
+
+    def fallback(group):
+        return fallback_order(group, games, pf, pa, name_rank, sanctioned)
+
+    resolved = []
+    for group in tie_groups(overall_order(wins, losses, pf, pa, name_rank), wins):
+        if len(group) == 1:
+            resolved.append(group)
+            continue
+
+        key = tuple(sorted(group.tolist()))
+        if cache is not None and key in cache:
+            resolved.append(cache[key])
+            continue
+
+        order = resolve_group(group, h2h_wins, h2h_points, h2h_games, fallback)
+        if cache is not None:
+            cache[key] = order
+        resolved.append(order)
+
+    return np.concatenate(resolved) if resolved else np.empty(0, dtype=np.int64)
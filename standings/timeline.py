@@ -0,0 +1,129 @@
+"""Round-by-round standings.
+
+A Timeline holds the standings after every round of a season: cumulative
+W / L / PF / PA per team come from per-round bincounts and a cumulative sum
+over the rounds axis, and the head-to-head matrices are updated round by
+round with only that round's games, so each round is ranked with the bylaw
+tiebreakers without recomputing anything from the first round. The result is
+a compact (rounds x teams) rank matrix, the same ranking as
+resolve_tiebreakers_with_bylaws on df[df.Round <= r] for every round r.
+"""
+import numpy as np
+import pandas as pd
+
+from standings.files import atomic_write
+from standings.season import Season
+from standings.tiebreak import name_ranks, rank_teams
+
+
+class Timeline:
+    """Standings of one season after each round, as (rounds x teams) arrays."""
+
+    def __init__(self, rounds, teams, names, wins, losses, pf, pa, ranks):
+        self.rounds = rounds
+        self.teams = teams
+        self.names = names
+        self.wins = wins
+        self.losses = losses
+        self.pf = pf
+        self.pa = pa
+        self.ranks = ranks
+
+    def rank_frame(self):
+        """Rank of every team (columns) after every round (rows)."""
+        return pd.DataFrame(self.ranks, index=pd.Index(self.rounds, name="Round"), columns=self.teams)
+
+    def table(self, round):
+        """Ranked standings after a round, with the export columns."""
+        r = int(np.searchsorted(self.rounds, round, side="right")) - 1
+        if r < 0:
+            raise KeyError(f"No round played up to round {round}")
+        order = np.argsort(self.ranks[r])
+        return pd.DataFrame({
+            "Rank": self.ranks[r, order], "Team": np.asarray(self.teams, dtype=object)[order],
+            "W": self.wins[r, order], "L": self.losses[r, order],
+            "PF": self.pf[r, order], "PA": self.pa[r, order],
+            "ClubName": np.asarray(self.names, dtype=object)[order],
+        })
+
+    def long_frame(self):
+        """One row per round and team: Round, Rank, Team, W, L, PF, PA, Diff."""
+        n_rounds, n_teams = self.ranks.shape
+        return pd.DataFrame({
+            "Round": np.repeat(self.rounds, n_teams),
+            "Rank": self.ranks.ravel(),
+            "Team": np.tile(np.asarray(self.teams, dtype=object), n_rounds),
+            "W": self.wins.ravel(), "L": self.losses.ravel(),
+            "PF": self.pf.ravel(), "PA": self.pa.ravel(),
+            "Diff": (self.pf - self.pa).ravel(),
+        }).sort_values(["Round", "Rank"], kind="stable").reset_index(drop=True)
+
+
+def season_timeline(season):
+    """Timeline of a Season over the rounds with at least one played game."""
+    n = len(season.teams)
+    played = season.played
+    rounds = np.unique(season.round[played])
+    n_rounds = len(rounds)
+
+    # Per-round totals in one bincount each, then prefix sums over the rounds
+    home, away = season.local.astype(np.int64), season.road.astype(np.int64)
+    step = np.searchsorted(rounds, season.round)
+    counted = played & (step < n_rounds)
+    home_won = season.home_win == 1
+    hs = season.home_score.astype(np.float64)
+    rs = season.road_score.astype(np.float64)
+
+    def per_round(team, mask, weights=None):
+        cells = step[mask] * n + team[mask]
+        w = None if weights is None else weights[mask]
+        return np.bincount(cells, weights=w, minlength=n_rounds * n).reshape(n_rounds, n)
+
+    wins = np.cumsum(per_round(home, counted & home_won) + per_round(away, counted & ~home_won), axis=0)
+    losses = np.cumsum(per_round(home, counted & ~home_won) + per_round(away, counted & home_won), axis=0)
+    pf = np.cumsum(per_round(home, counted, hs) + per_round(away, counted, rs), axis=0).astype(np.int64)
+    pa = np.cumsum(per_round(home, counted, rs) + per_round(away, counted, hs), axis=0).astype(np.int64)
+
+    # Head-to-head matrices updated with each round's games only
+    h2h_wins = np.zeros((n, n), dtype=np.int64)
+    h2h_points = np.zeros((n, n), dtype=np.float64)
+    h2h_games = np.zeros((n, n), dtype=np.int64)
+    by_round = np.argsort(season.round, kind="stable")
+    bounds = np.searchsorted(season.round[by_round], rounds, side="right")
+    name_rank = name_ranks(season.names)
+    ranks = np.empty((n_rounds, n), dtype=np.int16)
+    start = 0
+    for r, end in enumerate(bounds):
+        games = by_round[start:end]
+        start = end
+        h, a = home[games], away[games]
+        np.add.at(h2h_games, (h, a), 1)
+        np.add.at(h2h_games, (a, h), 1)
+        done = games[played[games]]
+        h, a, won = home[done], away[done], home_won[done]
+        np.add.at(h2h_wins, (np.where(won, h, a), np.where(won, a, h)), 1)
+        np.add.at(h2h_points, (h, a), hs[done])
+        np.add.at(h2h_points, (a, h), rs[done])
+
+        order = rank_teams(wins[r], losses[r], pf[r], pa[r], name_rank,
+                           h2h_wins, h2h_points, h2h_games, season.sanctioned)
+        ranks[r, order] = np.arange(1, n + 1)
+
+    return Timeline(rounds, list(season.teams), list(season.names), wins, losses, pf, pa, ranks)
+
+
+def standings_timeline(df, sanctioned_teams=None):
+    """Timeline of a calendar as returned by actual_calendar() or eurocup_calendar_2025()."""
+    return season_timeline(Season.from_dataframe(df, sanctioned_teams))
+
+
+def write_timeline(timeline, path, fmt="csv"):
+    """Write the long Round / Rank / Team table of a timeline as CSV or JSON, atomically."""
+    frame = timeline.long_frame()
+    if fmt == "csv":
+        data = frame.to_csv(index=False).encode("utf-8")
+    elif fmt == "json":
+        data = frame.to_json(orient="records").encode("utf-8")
+    else:
+        raise ValueError(f"Unknown timeline format: {fmt!r} (expected csv or json)")
+    return atomic_write(path, data)
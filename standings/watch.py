@@ -0,0 +1,139 @@
+"""Live watcher that keeps the export files in step with the games API.
+
+A Watcher polls every competition through a ResponseCache without TTL, so an
+unchanged feed costs a single 304. When the body did change, the per-game
+content hashes of the parse are compared with the previous poll (see
+parse.diff_games): only the competition, or the EuroCup groups, holding a
+changed game are ranked again, and an export file is only rewritten when its
+bytes differ from what is already on disk.
+
+The poll interval adapts to the feed: `fast` while results keep coming in
+(which includes live games, whose scores change on every poll), then doubling
+up to `slow` once nothing has changed for `window` seconds.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from standings.core import export_jobs
+from standings.export import render
+from standings.files import atomic_write, digest, file_digest
+from standings.http_cache import DEFAULT_DIR, ResponseCache
+from standings.parse import diff_games, parse_stream
+from standings.season import Season
+
+logger = logging.getLogger(__name__)
+
+FAST_INTERVAL = 5
+SLOW_INTERVAL = 300
+GAME_WINDOW = 3 * 3600
+
+
+def changed_groups(parsed, changed, removed):
+    """Groups holding a game that was added, changed or removed, from the result of diff_games."""
+    groups = parsed["groups"] or [None]
+    names = {groups[g] for g in np.unique(parsed["group"][changed])}
+    names.update(key[0] for key in removed)
+    return names
+
+
+class Watcher:
+    """Polls competitions and rewrites the exports whose contents changed."""
+
+    def __init__(self, competitions, out_dir=None, formats=("txt",), cache=None,
+                 fast=FAST_INTERVAL, slow=SLOW_INTERVAL, window=GAME_WINDOW, clock=time.monotonic):
+        self.competitions = list(competitions)
+        self.out_dir = Path(out_dir or os.getcwd())
+        self.formats = tuple(formats)
+        self.cache = cache or ResponseCache(DEFAULT_DIR, ttl=0)
+        self.fast = fast
+        self.slow = slow
+        self.window = window
+        self.clock = clock
+        self.interval = fast
+        self.last_change = None
+        self._bodies = {}
+        self._games = {}
+        self._written = {}
+
+    def poll(self):
+        """
+        One pass over every competition.
+
+        Returns:
+            list: Path of every export file rewritten
+        """
+        written = []
+        changed = False
+        for competition in self.competitions:
+            try:
+                paths, games_changed = self._poll_competition(competition)
+            except Exception:
+                # Keep the last good files and try again on the next poll
+                logger.exception("Polling %s failed", competition.key)
+                continue
+            written += paths
+            changed = changed or games_changed
+        self._schedule(changed)
+        return written
+
+    def _poll_competition(self, competition):
+        path = self.cache.fetch(competition.url, competition.key)
+        body = file_digest(path)
+        if self._bodies.get(competition.key) == body:
+            return [], False
+
+        with path.open("rb") as stream:
+            parsed = parse_stream(stream, competition.detect_sanctioned)
+        previous = self._games.get(competition.key)
+        games, changed, removed = diff_games(previous, parsed)
+        groups = None if previous is None else changed_groups(parsed, changed, removed)
+        written = []
+        if groups is None or groups:
+            season = Season.from_parsed(parsed, competition.code, competition.season)
+            written = self._write(export_jobs(competition, season, groups))
+
+        # Remember this body only once its exports are on disk, so a failed write is retried
+        self._bodies[competition.key] = body
+        self._games[competition.key] = games
+        return written, previous is not None and bool(groups)
+
+    def _write(self, jobs):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for filename, label, table in jobs:
+            for fmt in self.formats:
+                path = self.out_dir / Path(filename).with_suffix(f".{fmt}").name
+                data = render(table, label, fmt)
+                new = digest(data)
+                old = self._written.get(path) or file_digest(path)
+                if new != old:
+                    atomic_write(path, data)
+                    written.append(path)
+                self._written[path] = new
+        return written
+
+    def _schedule(self, changed):
+        now = self.clock()
+        if changed:
+            self.last_change = now
+        if self.last_change is not None and now - self.last_change < self.window:
+            self.interval = self.fast
+        else:
+            self.interval = min(self.interval * 2, self.slow)
+
+    def run(self, stop=None, max_polls=None):
+        """Poll until stop (a threading.Event) is set or max_polls passes have run."""
+        stop = stop or threading.Event()
+        polls = 0
+        while not stop.is_set():
+            for path in self.poll():
+                logger.info("Updated %s", path)
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            stop.wait(self.interval)
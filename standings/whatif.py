@@ -0,0 +1,164 @@
+"""Batched what-if scenarios over a base season.
+
+A scenario is a list of result overrides (game code, home score, road score)
+applied on top of a base Season. The base totals and head-to-head matrices are
+computed once; each batch only accumulates the deltas of its overrides with
+flat bincounts and then ranks every scenario with the bylaw tiebreakers.
+Equal scores clear a result, turning the game back into unplayed.
+"""
+import numpy as np
+
+from standings.tiebreak import name_ranks, rank_teams
+
+
+class ScenarioResults:
+    """Ranked tables of a batch of scenarios, as (scenarios x teams) arrays."""
+
+    def __init__(self, teams, names, sanctioned, order, wins, losses, pf, pa):
+        self.teams = teams
+        self.names = names
+        self.sanctioned = sanctioned
+        self.order = order
+        self.wins = wins
+        self.losses = losses
+        self.pf = pf
+        self.pa = pa
+
+    def __len__(self):
+        return len(self.order)
+
+    def positions(self):
+        """(scenarios x teams) final position of every team id, 1 = first."""
+        positions = np.empty_like(self.order)
+        rows = np.arange(len(self.order))[:, None]
+        positions[rows, self.order] = np.arange(1, self.order.shape[1] + 1)
+        return positions
+
+    def ranking(self, scenario):
+        """Team codes of one scenario from first to last."""
+        return [self.teams[k] for k in self.order[scenario]]
+
+    def table(self, scenario):
+        """Ranked standings of one scenario with the columns of resolve_tiebreakers_with_bylaws."""
+        import pandas as pd
+
+        order = self.order[scenario]
+        wins, losses = self.wins[scenario][order], self.losses[scenario][order]
+        pf, pa = self.pf[scenario][order], self.pa[scenario][order]
+        return pd.DataFrame({
+            "Team": [self.teams[k] for k in order],
+            "W": wins, "L": losses, "PF": pf, "PA": pa,
+            "Games": wins + losses, "Sanctioned": self.sanctioned[order],
+            "Diff": pf - pa, "Total": wins + losses,
+            "ClubName": [self.names[k] for k in order],
+        })
+
+
+class WhatIf:
+    """Base season aggregates shared by every scenario ranked against it."""
+
+    def __init__(self, season):
+        self.season = season
+        self.n_teams = len(season.teams)
+        self.totals = season.totals()
+        self.h2h_wins, self.h2h_points, self.h2h_games = season.head_to_head()
+        self.name_rank = name_ranks(season.names)
+        self.rows = {int(code): k for k, code in enumerate(season.game_code) if code}
+
+        played = season.played
+        self.played = played
+        self.home = season.local.astype(np.int64)
+        self.away = season.road.astype(np.int64)
+        self.hs = np.where(played, season.home_score, 0).astype(np.float64)
+        self.rs = np.where(played, season.road_score, 0).astype(np.float64)
+        self.home_won = season.home_win == 1
+
+    def _flatten(self, scenarios):
+        scenario, rows, hs, rs = [], [], [], []
+        for s, overrides in enumerate(scenarios):
+            for game, home_score, road_score in overrides:
+                scenario.append(s)
+                rows.append(self.rows[int(game)])
+                hs.append(home_score)
+                rs.append(road_score)
+        scenario = np.array(scenario, dtype=np.int64)
+        rows = np.array(rows, dtype=np.int64)
+        # A game overridden twice in one scenario keeps its last override
+        _, last = np.unique((scenario * len(self.home) + rows)[::-1], return_index=True)
+        keep = np.sort(len(rows) - 1 - last)
+        return scenario[keep], rows[keep], np.array(hs, dtype=np.float64)[keep], np.array(rs, dtype=np.float64)[keep]
+
+    def rank(self, scenarios, batch_size=2048):
+        """
+        Rank a batch of scenarios.
+
+        Args:
+            scenarios (list): one list of (game code, home score, road score) overrides per scenario
+            batch_size (int): scenarios whose head-to-head matrices are built at once
+        Returns:
+            ScenarioResults: order, wins, losses, pf and pa of every scenario
+        """
+        n_scen, n = len(scenarios), self.n_teams
+        order = np.empty((n_scen, n), dtype=np.int16)
+        totals = [np.empty((n_scen, n), dtype=np.float64) for _ in range(4)]
+
+        for start in range(0, n_scen, batch_size):
+            batch = scenarios[start:start + batch_size]
+            size = len(batch)
+            s, rows, hs, rs = self._flatten(batch)
+            home, away = self.home[rows], self.away[rows]
+
+            # Remove the base result of every overridden game, then add the override
+            base_played = self.played[rows]
+            base_won = self.home_won[rows]
+            new_played = hs != rs
+            new_won = hs > rs
+            parts = [
+                (s[base_played], home[base_played], away[base_played], base_won[base_played],
+                 self.hs[rows][base_played], self.rs[rows][base_played], -1.0),
+                (s[new_played], home[new_played], away[new_played], new_won[new_played],
+                 hs[new_played], rs[new_played], 1.0),
+            ]
+
+            wins = np.zeros(size * n)
+            losses = np.zeros(size * n)
+            pf = np.zeros(size * n)
+            pa = np.zeros(size * n)
+            h2h_wins = np.zeros(size * n * n)
+            h2h_points = np.zeros(size * n * n)
+            for ps, ph, pa_, pwon, phs, prs, sign in parts:
+                winner = np.where(pwon, ph, pa_)
+                loser = np.where(pwon, pa_, ph)
+                wins += sign * np.bincount(ps * n + winner, minlength=size * n)
+                losses += sign * np.bincount(ps * n + loser, minlength=size * n)
+                pf += sign * (np.bincount(ps * n + ph, weights=phs, minlength=size * n)
+                              + np.bincount(ps * n + pa_, weights=prs, minlength=size * n))
+                pa += sign * (np.bincount(ps * n + ph, weights=prs, minlength=size * n)
+                              + np.bincount(ps * n + pa_, weights=phs, minlength=size * n))
+                cell = ps * n * n
+                h2h_wins += sign * np.bincount(cell + winner * n + loser, minlength=size * n * n)
+                h2h_points += sign * (np.bincount(cell + ph * n + pa_, weights=phs, minlength=size * n * n)
+                                      + np.bincount(cell + pa_ * n + ph, weights=prs, minlength=size * n * n))
+
+            base_wins, base_losses, base_pf, base_pa = self.totals
+            wins = wins.reshape(size, n) + base_wins
+            losses = losses.reshape(size, n) + base_losses
+            pf = pf.reshape(size, n) + base_pf
+            pa = pa.reshape(size, n) + base_pa
+            h2h_wins = h2h_wins.reshape(size, n, n) + self.h2h_wins
+            h2h_points = h2h_points.reshape(size, n, n) + self.h2h_points
+
+            for k in range(size):
+                order[start + k] = rank_teams(wins[k], losses[k], pf[k], pa[k], self.name_rank,
+                                              h2h_wins[k], h2h_points[k], self.h2h_games, self.season.sanctioned)
+            for total, block in zip(totals, (wins, losses, pf, pa)):
+                total[start:start + size] = block
+
+        wins, losses, pf, pa = totals
+        return ScenarioResults(self.season.teams, self.season.names, self.season.sanctioned, order,
+                               wins.astype(np.int64), losses.astype(np.int64), pf, pa)
+
+
+def rank_scenarios(season, scenarios, batch_size=2048):
+    """Rank scenarios of (game code, home score, road score) overrides on top of season."""
+    return WhatIf(season).rank(scenarios, batch_size)
@@ -0,0 +1,108 @@
+"""Local stand-in for the games API shared by the network tests.
+
+FakeAPI serves JSON bodies per path from a ThreadingHTTPServer on 127.0.0.1,
+with a strong ETag per body and 304 answers to a matching If-None-Match. Tests
+can queue failure statuses per path and read back every request, its status
+and the number of TCP connections the client opened.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeAPI:
+    """Bodies, queued failures and a request log behind a local HTTP server."""
+
+    def __init__(self):
+        self.bodies = {}
+        self.failures = {}
+        self.requests = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    @property
+    def base(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base + path
+
+    def set_json(self, path, payload):
+        """Serve payload as the JSON body of path; its ETag changes with the body."""
+        with self.lock:
+            self.bodies[path] = json.dumps(payload).encode("utf-8")
+
+    def fail(self, path, *statuses):
+        """Answer the next requests to path with these statuses, one per request."""
+        with self.lock:
+            self.failures.setdefault(path, []).extend(statuses)
+
+    def statuses(self, path=None):
+        with self.lock:
+            return [status for p, status, _ in self.requests if path is None or p == path]
+
+    def times(self, path=None):
+        with self.lock:
+            return [at for p, _, at in self.requests if path is None or p == path]
+
+
+def _handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with api.lock:
+                api.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=()):
+            with api.lock:
+                api.requests.append((self.path, status, time.monotonic()))
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            with api.lock:
+                queued = api.failures.get(self.path)
+                status = queued.pop(0) if queued else None
+                body = api.bodies.get(self.path)
+            if status is not None:
+                self._send(status, b"{}", [("Retry-After", "0")] if status == 429 else ())
+                return
+            if body is None:
+                self._send(404, b"{}")
+                return
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers=[("ETag", etag)])
+                return
+            self._send(200, body, [("ETag", etag), ("Content-Type", "application/json")])
+
+    return Handler
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeAPI()
+    api.server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(api))
+    api.server.daemon_threads = True
+    thread = threading.Thread(target=api.server.serve_forever, daemon=True)
+    thread.start()
+    yield api
+    api.server.shutdown()
+    api.server.server_close()
@@ -0,0 +1,20 @@
+"""Clinch / elimination search: answers in seconds with 40+ games left."""
+import time
+
+from standings.clinch import clinch_table, has_clinched
+from standings.synthetic import synthetic_calendar
+
+
+def test_clinch_table_40_games_left_in_seconds():
+    df, sanctioned = synthetic_calendar(n_teams=18, played=0.85, tie_rate=0.5, seed=0)
+    assert df["HomeWin"].isna().sum() >= 40
+
+    start = time.perf_counter()
+    assert has_clinched(df, "T04", 10, sanctioned)
+    six = clinch_table(df, 6, sanctioned)
+    ten = clinch_table(df, 10, sanctioned)
+    assert time.perf_counter() - start < 5
+
+    for table in (six, ten):
+        assert not (table["Clinched"] & table["Eliminated"]).any()
+    assert set(ten.loc[ten["Clinched"], "Team"]) >= set(six.loc[six["Clinched"], "Team"])
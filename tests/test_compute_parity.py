@@ -0,0 +1,55 @@
+"""Parity of the vectorized compute_standings_with_bylaws with the original iterrows loop."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from standings.core import compute_standings_with_bylaws
+from standings.synthetic import synthetic_calendar
+
+
+def compute_standings_iterrows(df, sanctioned_teams=None):
+    """The row-by-row implementation compute_standings_with_bylaws replaced."""
+    if sanctioned_teams is None:
+        sanctioned_teams = []
+
+    teams = pd.unique(df[["Local", "Visitor"]].values.ravel())
+    standings = {team: {"W": 0, "L": 0, "PF": 0, "PA": 0, "Games": 0, "Sanctioned": team in sanctioned_teams} for team in teams}
+
+    for _, row in df.iterrows():
+        if np.isnan(row["HomeWin"]):
+            continue
+        home, away = row["Local"], row["Visitor"]
+        hs, rs = row["HomeScore"], row["RoadScore"]
+
+        standings[home]["Games"] += 1
+        standings[away]["Games"] += 1
+        standings[home]["PF"] += hs
+        standings[home]["PA"] += rs
+        standings[away]["PF"] += rs
+        standings[away]["PA"] += hs
+
+        if row["HomeWin"] == 1:
+            standings[home]["W"] += 1
+            standings[away]["L"] += 1
+        else:
+            standings[away]["W"] += 1
+            standings[home]["L"] += 1
+
+    return standings
+
+
+@pytest.mark.parametrize("n_teams, groups, played, seed", [
+    (60, 1, 0.8, 0),
+    (60, 3, 0.5, 1),
+    (80, 4, 1.0, 2),
+])
+def test_matches_iterrows(n_teams, groups, played, seed):
+    df, sanctioned = synthetic_calendar(n_teams=n_teams, groups=groups, played=played, forfeits=3, seed=seed)
+    assert len(df) >= 1000
+
+    expected = compute_standings_iterrows(df, sanctioned)
+    actual = compute_standings_with_bylaws(df, sanctioned)
+
+    assert list(actual) == list(expected)
+    for team, row in expected.items():
+        assert actual[team] == pytest.approx(row), team
@@ -0,0 +1,85 @@
+"""Concurrent fetcher: retries with backoff and the per-host rate limit."""
+import time
+
+import pytest
+import requests
+
+from standings.fetch import HostRateLimiter, fetch_many, fetch_with_retry
+from standings.http_cache import ResponseCache
+from standings.synthetic import synthetic_payload
+
+TEMPLATE = "/v2/competitions/{code}/seasons/{code}{season}/games"
+
+
+def _cache(tmp_path, ttl=0):
+    return ResponseCache(tmp_path, ttl=ttl, session=requests.Session())
+
+
+def test_retries_5xx_and_429_with_backoff(fake_api, tmp_path):
+    path = TEMPLATE.format(code="E", season=2025)
+    fake_api.set_json(path, synthetic_payload(n_teams=4))
+    fake_api.fail(path, 503, 429)
+
+    fetch_with_retry(fake_api.url(path), "E2025", _cache(tmp_path), HostRateLimiter(0), retries=3, backoff=0.1)
+
+    assert fake_api.statuses(path) == [503, 429, 200]
+    first, second, third = fake_api.times(path)
+    assert second - first >= 0.1
+    assert third - second >= 0.2
+
+
+def test_gives_up_after_the_last_retry(fake_api, tmp_path):
+    path = TEMPLATE.format(code="E", season=2025)
+    fake_api.set_json(path, synthetic_payload(n_teams=4))
+    fake_api.fail(path, 500, 502, 503)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_with_retry(fake_api.url(path), "E2025", _cache(tmp_path), HostRateLimiter(0), retries=2, backoff=0.01)
+    assert fake_api.statuses(path) == [500, 502, 503]
+
+
+def test_client_errors_are_not_retried(fake_api, tmp_path):
+    path = TEMPLATE.format(code="E", season=2025)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_with_retry(fake_api.url(path), "E2025", _cache(tmp_path), HostRateLimiter(0), backoff=0.01)
+    assert fake_api.statuses(path) == [404]
+
+
+def test_rate_limits_network_requests_only(fake_api, tmp_path):
+    pairs = [("E", season) for season in range(2020, 2025)]
+    for code, season in pairs:
+        fake_api.set_json(TEMPLATE.format(code=code, season=season), synthetic_payload(n_teams=4, seed=season))
+    cache = _cache(tmp_path, ttl=60)
+
+    results = fetch_many(pairs, max_workers=5, per_second=10, cache=cache, api_url=fake_api.base + TEMPLATE)
+    assert set(results) == set(pairs)
+    starts = sorted(fake_api.times())
+    assert len(starts) == len(pairs)
+    assert starts[-1] - starts[0] >= 0.35
+
+    start = time.perf_counter()
+    again = fetch_many(pairs, max_workers=5, per_second=1, cache=cache, api_url=fake_api.base + TEMPLATE)
+    assert time.perf_counter() - start < 0.5
+    assert len(fake_api.times()) == len(pairs)
+    for pair in pairs:
+        assert again[pair][0].equals(results[pair][0])
+
+
+def test_truncated_body_is_retried(fake_api, tmp_path, monkeypatch):
+    path = TEMPLATE.format(code="E", season=2025)
+    fake_api.set_json(path, synthetic_payload(n_teams=4))
+    cache = _cache(tmp_path)
+    fetch = cache.fetch
+    calls = []
+
+    def flaky(url, key, timeout=30):
+        calls.append(url)
+        if len(calls) == 1:
+            raise requests.exceptions.ChunkedEncodingError("connection broken mid-body")
+        return fetch(url, key, timeout)
+
+    monkeypatch.setattr(cache, "fetch", flaky)
+    fetch_with_retry(fake_api.url(path), "E2025", cache, HostRateLimiter(0), backoff=0.01)
+    assert len(calls) == 2
+    assert fake_api.statuses(path) == [200]
@@ -0,0 +1,33 @@
+"""Atomic writes: file modes and cleanup on failure."""
+import os
+
+import pytest
+
+from standings import files
+from standings.files import UMASK, atomic_write
+
+
+def test_new_file_follows_umask_and_existing_mode_is_kept(tmp_path):
+    path = atomic_write(tmp_path / "a.txt", b"one")
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~UMASK
+
+    os.chmod(path, 0o640)
+    atomic_write(path, [b"tw", b"o"])
+    assert path.read_bytes() == b"two"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="no os.fchmod")
+def test_failed_chmod_leaks_no_descriptor(tmp_path, monkeypatch):
+    def fail(fd, mode):
+        raise PermissionError("fchmod")
+
+    monkeypatch.setattr(files.os, "fchmod", fail)
+    before = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+    for _ in range(5):
+        with pytest.raises(PermissionError):
+            atomic_write(tmp_path / "a.txt", b"data")
+
+    assert list(tmp_path.iterdir()) == []
+    if before is not None:
+        assert len(os.listdir("/proc/self/fd")) == before
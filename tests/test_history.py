@@ -0,0 +1,81 @@
+"""Cross-season history: queries, tie methods and persistence."""
+import numpy as np
+import pandas as pd
+
+from standings.history import History, summarize
+from standings.parse import parse_items
+from standings.season import Season
+from standings.store import GameStore
+from standings.synthetic import synthetic_payload
+
+
+def _store(tmp_path, years=(2023, 2024)):
+    store = GameStore(tmp_path / "store")
+    for year in years:
+        parsed = parse_items(synthetic_payload(n_teams=8, tie_rate=0.6, seed=year)["data"], detect_sanctioned=True)
+        store.write(Season.from_parsed(parsed, "E", year))
+    return store
+
+
+def _round_robin(scores):
+    """Season of teams A, B, C from {(home, road): (home score, road score)}."""
+    teams = ["A", "B", "C"]
+    games = [(teams.index(h), teams.index(r), hs, rs) for (h, r), (hs, rs) in scores.items()]
+    local, road, hs, rs = (np.array(col) for col in zip(*games))
+    return Season(teams, teams, local, road, hs, rs, (hs > rs).astype(int), np.ones(len(games), dtype=bool),
+                  np.arange(1, len(games) + 1), code="E", season=2025)
+
+
+def test_queries_on_an_empty_store(tmp_path):
+    history = History.build(GameStore(tmp_path / "empty"), processes=1)
+
+    assert history.team("T0").empty and history.at_rank(1).empty
+    assert history.wins_for_rank(1)["tables"] == 0
+    assert history.missed_top(10, 4, 3).empty and history.tie_usage(2).empty
+    assert history.head_to_head("T0", "T1").empty
+
+
+def test_queries_and_missing_rank(tmp_path):
+    history = History.build(_store(tmp_path), processes=1)
+
+    assert len(history.at_rank(1)) == 2
+    assert history.at_rank(99).empty
+    assert history.wins_for_rank(99, "E")["tables"] == 0
+    assert history.wins_for_rank(1, "U") == {"rank": 1, "tables": 0, "mean": None, "min": None, "max": None}
+    first = history.wins_for_rank(1)
+    assert first["tables"] == 2 and first["min"] <= first["mean"] <= first["max"]
+    assert set(history.team("T0")["Season"]) == {2023, 2024}
+
+
+def test_save_load_round_trip(tmp_path):
+    store = _store(tmp_path)
+    history = History.build(store, processes=1)
+    history.save(tmp_path / "history")
+    assert not list((tmp_path / "history").glob("*.pkl"))
+
+    loaded = History.load(tmp_path / "history")
+    for name in ("ranks", "ties", "h2h"):
+        pd.testing.assert_frame_equal(getattr(loaded, name), getattr(history, name))
+    assert loaded.fingerprints == history.fingerprints
+    assert loaded.update(store) == []
+
+    empty = History()
+    empty.save(tmp_path / "empty")
+    assert History.load(tmp_path / "empty").wins_for_rank(1)["tables"] == 0
+
+
+def test_tie_method_is_the_criterion_that_decided():
+    # Every pair met twice and split, by the same margins: the mini-table cannot separate them
+    level = _round_robin({("A", "B"): (80, 70), ("B", "A"): (80, 70), ("A", "C"): (80, 70),
+                          ("C", "A"): (80, 70), ("B", "C"): (80, 70), ("C", "B"): (80, 70)})
+    ranks, ties, _ = summarize("E", 2025, "", level, level.ranking())
+    assert list(ranks["TieMethod"]) == ["fallback"] * 3
+    assert list(ties["Method"]) == ["fallback"]
+
+    # Head-to-head point difference puts A first, then B and C stay level among themselves
+    split = _round_robin({("A", "B"): (90, 70), ("B", "A"): (80, 70), ("A", "C"): (90, 70),
+                          ("C", "A"): (80, 70), ("B", "C"): (80, 70), ("C", "B"): (80, 70)})
+    ranks, ties, _ = summarize("E", 2025, "", split, split.ranking())
+    assert ranks["Team"].iloc[0] == "A"
+    assert list(ranks["TieMethod"]) == ["h2h", "fallback", "fallback"]
+    assert list(ties["Method"]) == ["h2h+fallback"]
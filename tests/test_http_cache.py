@@ -0,0 +1,55 @@
+"""Response cache revalidation against a local stand-in server."""
+import json
+
+import pytest
+import requests
+
+from standings.http_cache import ResponseCache
+
+PATH = "/v2/competitions/E/seasons/E2025/games"
+
+
+def test_200_then_304_then_changed_body(fake_api, tmp_path):
+    fake_api.set_json(PATH, {"data": [1]})
+    cache = ResponseCache(tmp_path, ttl=0, session=requests.Session())
+    url = fake_api.url(PATH)
+
+    assert json.loads(cache.get(url, "E2025")) == {"data": [1]}
+    assert json.loads(cache.get(url, "E2025")) == {"data": [1]}
+    fake_api.set_json(PATH, {"data": [2]})
+    assert json.loads(cache.get(url, "E2025")) == {"data": [2]}
+    assert fake_api.statuses(PATH) == [200, 304, 200]
+
+
+def test_fresh_entry_skips_the_network(fake_api, tmp_path):
+    fake_api.set_json(PATH, {"data": []})
+    cache = ResponseCache(tmp_path, ttl=60, session=requests.Session())
+
+    for _ in range(3):
+        cache.fetch(fake_api.url(PATH), "E2025")
+    assert fake_api.statuses(PATH) == [200]
+
+
+def test_responses_are_released_to_the_pool(fake_api, tmp_path):
+    fake_api.set_json(PATH, {"data": []})
+    cache = ResponseCache(tmp_path, ttl=0, session=requests.Session())
+
+    for _ in range(5):
+        cache.fetch(fake_api.url(PATH), "E2025")
+    fake_api.fail(PATH, 503, 503)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            cache.fetch(fake_api.url(PATH), "E2025")
+    cache.fetch(fake_api.url(PATH), "E2025")
+
+    assert fake_api.statuses(PATH) == [200, 304, 304, 304, 304, 503, 503, 304]
+    assert fake_api.connections == 1
+
+
+def test_304_without_cached_body_is_an_error(fake_api, tmp_path):
+    fake_api.fail(PATH, 304)
+    cache = ResponseCache(tmp_path, ttl=0, session=requests.Session())
+
+    with pytest.raises(requests.HTTPError):
+        cache.fetch(fake_api.url(PATH), "E2025")
+    assert not (tmp_path / "E2025.body").exists()
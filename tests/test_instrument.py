@@ -0,0 +1,14 @@
+"""Stage instrumentation switches."""
+import pytest
+
+from standings.instrument import env_flag
+
+
+@pytest.mark.parametrize("value", ["1", "true", "TRUE", "yes", " Yes "])
+def test_truthy_values_enable(value):
+    assert env_flag(value)
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false", "False", "no", "off"])
+def test_other_values_leave_it_off(value):
+    assert not env_flag(value)
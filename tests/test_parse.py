@@ -0,0 +1,90 @@
+"""Games payload parser: validation, game states, forfeits and diffs."""
+import io
+import json
+
+import pytest
+
+from standings.parse import FINAL, FORFEIT, LIVE, SCHEDULED, UNPLAYED, diff_games, parse_items, parse_stream
+
+
+def _game(code, local="AAA", road="BBB", l_score=80, v_score=70, played=True, rnd=1, **extra):
+    game = {
+        "gameCode": code, "round": rnd, "played": played, "group": {"rawName": "Regular Season"},
+        "local": {"club": {"code": local, "name": f"Club {local}"}, "score": l_score, "standingsScore": l_score},
+        "road": {"club": {"code": road, "name": f"Club {road}"}, "score": v_score, "standingsScore": v_score},
+    }
+    game.update(extra)
+    return game
+
+
+@pytest.mark.parametrize("field, value", [
+    ("score", 40_000), ("score", -40_000), ("score", True), ("standingsScore", False), ("score", "80"),
+])
+def test_bad_scores_are_rejected(field, value):
+    bad = _game(2)
+    bad["local"][field] = value
+    parsed = parse_items([_game(1), bad, _game(3, rnd=2)])
+
+    assert parsed["game_code"].tolist() == [1, 3]
+    assert [(position, code) for position, code, _ in parsed["rejected"]] == [(1, 2)]
+
+
+def test_out_of_range_game_code_and_bool_round_are_rejected():
+    parsed = parse_items([_game(2 ** 31), _game(2, rnd=True), _game(3)])
+    assert parsed["game_code"].tolist() == [3]
+    assert len(parsed["rejected"]) == 2
+
+
+def test_null_standings_score_falls_back_to_score():
+    game = _game(1, l_score=81, v_score=79)
+    game["local"]["standingsScore"] = None
+    del game["road"]["standingsScore"]
+    parsed = parse_items([game])
+
+    assert (parsed["home_score"][0], parsed["road_score"][0], parsed["home_win"][0]) == (81, 79, 1)
+
+
+def test_live_and_scheduled_games_stay_unplayed():
+    parsed = parse_items([_game(1, l_score=0, v_score=0, played=False),
+                          _game(2, l_score=44, v_score=44, played=False),
+                          _game(3, l_score=0, v_score=0, played=None)])
+
+    assert parsed["state"].tolist() == [SCHEDULED, LIVE, SCHEDULED]
+    assert parsed["home_win"].tolist() == [UNPLAYED] * 3
+    assert parsed["home_score"].tolist() == [0, 0, 0]
+
+
+def test_tied_final_is_rejected():
+    parsed = parse_items([_game(1, l_score=75, v_score=75, played=True), _game(2)])
+    assert parsed["game_code"].tolist() == [2]
+    assert "tied" in parsed["rejected"][0][2]
+
+
+@pytest.mark.parametrize("l_score, v_score, sanctioned", [(20, 0, ["BBB"]), (0, 20, ["AAA"])])
+def test_forfeit_sanctions_the_loser(l_score, v_score, sanctioned):
+    parsed = parse_items([_game(1, l_score=l_score, v_score=v_score), _game(2, rnd=2)], detect_sanctioned=True)
+    assert parsed["state"].tolist() == [FORFEIT, FINAL]
+    assert parsed["sanctioned"] == sanctioned
+    assert parse_items([_game(1, l_score=l_score, v_score=v_score)])["sanctioned"] == []
+
+
+def test_stream_and_items_agree():
+    games = [_game(k, rnd=k) for k in range(1, 6)]
+    streamed = parse_stream(io.BytesIO(json.dumps({"data": games}).encode("utf-8")))
+    items = parse_items(games)
+    for name in ("game_code", "local", "road", "home_score", "road_score", "hash"):
+        assert streamed[name].tolist() == items[name].tolist()
+
+
+def test_diff_games_reports_added_changed_and_removed():
+    first = parse_items([_game(1), _game(2, "CCC", "DDD", 0, 0, played=False), _game(3, "EEE", "FFF", rnd=2)])
+    keys, changed, removed = diff_games(None, first)
+    assert changed.tolist() == [0, 1, 2] and removed == []
+
+    second = parse_items([_game(1), _game(2, "CCC", "DDD", 66, 70), _game(4, "GGG", "HHH", rnd=3)])
+    keys, changed, removed = diff_games(keys, second)
+    assert changed.tolist() == [1, 2]
+    assert removed == [("Regular Season", 2, "EEE", "FFF")]
+
+    _, changed, removed = diff_games(keys, second)
+    assert changed.tolist() == [] and removed == []
@@ -0,0 +1,19 @@
+"""Compact Season built from a games DataFrame."""
+import numpy as np
+
+from standings.season import Season
+from standings.synthetic import synthetic_calendar
+
+
+def test_rows_without_team_code_are_dropped():
+    df, sanctioned = synthetic_calendar(n_teams=8, played=0.7, seed=2)
+    broken = df.copy()
+    broken.loc[3, "Local"] = None
+    broken.loc[7, "Visitor"] = np.nan
+
+    season = Season.from_dataframe(broken, sanctioned)
+    clean = Season.from_dataframe(broken.drop(index=[3, 7]), sanctioned)
+
+    assert season.n_games == len(df) - 2
+    assert (season.local >= 0).all() and (season.road >= 0).all()
+    assert season.table().equals(clean.table())
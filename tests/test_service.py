@@ -0,0 +1,65 @@
+"""Standings service against a local stand-in of the games API."""
+import threading
+
+import pytest
+import requests
+
+from standings.core import EUROLEAGUE
+from standings.http_cache import ResponseCache
+from standings.service import StandingsService, etag_matches, make_server
+from standings.synthetic import synthetic_payload
+
+TEMPLATE = "/v2/competitions/{code}/seasons/{code}{season}/games"
+PATH = TEMPLATE.format(code="E", season=2025)
+
+
+@pytest.fixture
+def service(fake_api, tmp_path):
+    fake_api.set_json(PATH, synthetic_payload(n_teams=8, played=0.5, seed=3))
+    competition = EUROLEAGUE.with_api_url(fake_api.base + TEMPLATE)
+    cache = ResponseCache(tmp_path, ttl=0, session=requests.Session())
+    service = StandingsService([competition], cache=cache)
+    service.refresh()
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service.base = "http://127.0.0.1:%d" % server.server_address[1]
+    yield service
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True), ('W/"abc"', True), ('"x", "abc"', True), ('"x",W/"abc" ', True), ("*", True),
+    ('"ab"', False), ('"abcd"', False), ('"stale"abc"', False), ("", False), (None, False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_200_then_304_on_matching_etag(service):
+    first = requests.get(service.base + "/standings/el")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        again = requests.get(service.base + "/standings/el", headers={"If-None-Match": header})
+        assert again.status_code == 304 and again.headers["ETag"] == etag
+    assert requests.get(service.base + "/standings/el", headers={"If-None-Match": '"x' + etag}).status_code == 200
+
+
+def test_whatif_rejects_bad_and_unknown_games(service):
+    assert requests.get(service.base + "/whatif/el", params={"result": "bad"}).status_code == 400
+    unknown = requests.get(service.base + "/whatif/el", params={"result": "999999:80-70"})
+    assert unknown.status_code == 400 and "999999" in unknown.json()["error"]
+    assert requests.get(service.base + "/whatif/el", params={"result": "1:80-70"}).status_code == 200
+
+
+def test_refresh_after_upstream_change(service, fake_api):
+    before = requests.get(service.base + "/standings/el")
+    assert service.refresh() == []
+
+    fake_api.set_json(PATH, synthetic_payload(n_teams=8, played=0.8, seed=3))
+    assert service.refresh() == ["E2025"]
+    after = requests.get(service.base + "/standings/el", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"] and after.content != before.content
@@ -0,0 +1,33 @@
+"""Monte Carlo position probabilities."""
+import numpy as np
+import pytest
+
+from standings.core import resolve_tiebreakers_with_bylaws
+from standings.simulate import simulate_positions
+from standings.synthetic import synthetic_calendar
+
+
+@pytest.mark.parametrize("played", [0.0, 0.6, 0.9])
+def test_probabilities_sum_to_one(played):
+    df, sanctioned = synthetic_calendar(n_teams=12, played=played, tie_rate=0.5, seed=3)
+    odds = simulate_positions(df, n_sims=2_000, sanctioned_teams=sanctioned, seed=0, batch_size=700, processes=1)
+
+    assert odds.shape == (12, 12)
+    np.testing.assert_allclose(odds.sum(axis=1), 1)
+    np.testing.assert_allclose(odds.sum(axis=0), 1)
+
+
+def test_decided_table_is_certain():
+    df, sanctioned = synthetic_calendar(n_teams=10, played=1.0, tie_rate=0.6, forfeits=1, seed=1)
+    odds = simulate_positions(df, n_sims=50, sanctioned_teams=sanctioned, seed=0, processes=1)
+
+    final = resolve_tiebreakers_with_bylaws(df, sanctioned)["Team"]
+    for position, team in enumerate(final, start=1):
+        assert odds.loc[team, position] == 1
+
+
+@pytest.mark.parametrize("n_sims", [0, -5])
+def test_rejects_non_positive_n_sims(n_sims):
+    df, sanctioned = synthetic_calendar(n_teams=6, played=0.5, seed=0)
+    with pytest.raises(ValueError):
+        simulate_positions(df, n_sims=n_sims, sanctioned_teams=sanctioned, processes=1)
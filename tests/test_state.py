@@ -0,0 +1,61 @@
+"""StandingsState: results applied and reverted one game at a time match a full recompute."""
+import numpy as np
+import pytest
+
+from standings.core import resolve_tiebreakers_with_bylaws
+from standings.state import StandingsState
+from standings.synthetic import synthetic_calendar
+
+COLUMNS = ["Team", "W", "L", "PF", "PA"]
+
+
+def _unplay(df, rounds):
+    df = df.copy()
+    later = df["Round"] > rounds
+    df.loc[later, ["HomeWin", "RoadWin", "HomeScore", "RoadScore", "PlusMinus"]] = np.nan
+    return df
+
+
+def _assert_same(state, expected):
+    table = state.table()
+    assert table["Team"].tolist() == expected["Team"].tolist()
+    for column in COLUMNS[1:]:
+        np.testing.assert_allclose(table[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_apply_then_revert_matches_full_recompute(seed):
+    df, sanctioned = synthetic_calendar(n_teams=10, played=1.0, tie_rate=0.6, forfeits=1, seed=seed)
+    first = df[df["Round"] == 1]
+    teams = first["Local"].tolist() + first["Visitor"].tolist()
+    names = first["Local_Name"].tolist() + first["Visitor_Name"].tolist()
+    state = StandingsState(teams, names, sanctioned)
+    rounds = sorted(df["Round"].unique())
+
+    # Fixtures are registered round by round, so each step equals ranking df[df.Round <= r]
+    for r in rounds:
+        games = df[df["Round"] == r]
+        for game in games.itertuples():
+            state.add_fixture(game.Round, game.Local, game.Visitor)
+        for game in games.itertuples():
+            state.apply_result(game.Round, game.Local, game.Visitor, game.HomeScore, game.RoadScore)
+        _assert_same(state, resolve_tiebreakers_with_bylaws(df[df["Round"] <= r], sanctioned))
+
+    # Reverting keeps every fixture, so each step equals the calendar with the later rounds unplayed
+    for r in reversed(rounds):
+        for game in df[df["Round"] == r].itertuples():
+            state.revert_result(game.Round, game.Local, game.Visitor)
+        _assert_same(state, resolve_tiebreakers_with_bylaws(_unplay(df, r - 1), sanctioned))
+    assert state.results == {}
+
+
+def test_rejects_tied_score_and_unknown_game():
+    df, sanctioned = synthetic_calendar(n_teams=6, played=0.5, seed=0)
+    state = StandingsState.from_calendar(df, sanctioned)
+    game = df[df["HomeWin"].isna()].iloc[0]
+
+    with pytest.raises(ValueError):
+        state.apply_result(game["Round"], game["Local"], game["Visitor"], 80, 80)
+    with pytest.raises(KeyError):
+        state.apply_result(99, game["Local"], game["Visitor"], 80, 70)
+    assert (game["Round"], game["Local"], game["Visitor"]) not in state.results
@@ -0,0 +1,75 @@
+"""Columnar game store: round trip, upsert and version swaps."""
+import os
+import time
+
+import numpy as np
+
+from standings import store as store_module
+from standings.files import UMASK
+from standings.parse import parse_items
+from standings.season import COLUMNS, Season
+from standings.store import GameStore
+from standings.synthetic import synthetic_payload
+
+
+def _season(**kwargs):
+    parsed = parse_items(synthetic_payload(**kwargs)["data"], detect_sanctioned=True)
+    return Season.from_parsed(parsed, "E", 2025)
+
+
+def test_write_load_round_trip(tmp_path):
+    season = _season(n_teams=8, played=0.6, forfeits=1, seed=4)
+    store = GameStore(tmp_path)
+    store.write(season)
+
+    loaded = store.load("E", 2025)
+    assert ("E", 2025) in store and store.partitions() == [("E", 2025)]
+    for name in COLUMNS:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(season, name))
+    assert loaded.teams == season.teams and loaded.names == season.names
+    assert loaded.table().equals(season.table())
+
+
+def test_versions_follow_the_umask(tmp_path):
+    store = GameStore(tmp_path)
+    store.write(_season(n_teams=4))
+
+    version = store.current("E", 2025)
+    assert os.stat(version).st_mode & 0o777 == 0o777 & ~UMASK
+    assert os.stat(version / "meta.json").st_mode & 0o777 == 0o666 & ~UMASK
+
+
+def test_upsert_updates_results_and_lifts_sanctions(tmp_path):
+    store = GameStore(tmp_path)
+    store.write(_season(n_teams=8, played=0.5, forfeits=1, seed=1))
+    assert store.load("E", 2025).sanctioned.any()
+
+    fresh = _season(n_teams=8, played=0.9, seed=1)
+    store.upsert(fresh)
+    merged = store.load("E", 2025)
+    assert merged.n_games == fresh.n_games
+    assert not merged.sanctioned.any()
+    assert merged.table().equals(fresh.table())
+
+
+def test_version_swap_keeps_previous_and_running_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, "STALE_AFTER", 0)
+    store = GameStore(tmp_path)
+    partition = store.path("E", 2025)
+
+    store.write(_season(n_teams=4, played=0.2))
+    first = store.current("E", 2025)
+    store.write(_season(n_teams=4, played=0.5))
+    second = store.current("E", 2025)
+    assert second != first and first.exists()
+
+    # A version another writer is still filling, newer than the live one
+    running = partition / f"v{time.time_ns():020d}-running"
+    running.mkdir()
+    store.write(_season(n_teams=4, played=0.8))
+    third = store.current("E", 2025)
+
+    assert not first.exists()
+    assert second.exists() and running.exists()
+    assert store.load("E", 2025).played.sum() == _season(n_teams=4, played=0.8).played.sum()
+    assert third != second
@@ -0,0 +1,68 @@
+"""Fixed tie fixtures for resolve_group / rank_teams."""
+import numpy as np
+
+from standings.tiebreak import head_to_head_matrices, rank_teams
+
+
+def _rank(games, wins, pf, pa, names, sanctioned=None):
+    """rank_teams with head-to-head matrices from (home, away, home score, road score) games."""
+    home, away, hs, rs = (np.array(column) for column in zip(*games))
+    n = len(wins)
+    h2h_wins, h2h_points, h2h_games = head_to_head_matrices(
+        home, away, hs, rs, (hs > rs).astype(float), n)
+    wins = np.array(wins)
+    return rank_teams(wins, np.full(n, 20) - wins, np.array(pf, dtype=float), np.array(pa, dtype=float),
+                      np.array(names), h2h_wins, h2h_points, h2h_games,
+                      None if sanctioned is None else np.array(sanctioned)).tolist()
+
+
+def test_three_way_tie_restarts_on_the_remaining_pair():
+    A, B, C, X = range(4)
+    games = [
+        (A, B, 90, 70), (B, A, 70, 90),   # A wins both by 20
+        (A, C, 80, 78), (C, A, 78, 80),   # A wins both by 2
+        (B, C, 85, 80), (C, B, 81, 80),   # split, B +4 between them
+    ]
+    # Over the three-team mini-table C (-8) is ahead of B (-36), and C has the
+    # better overall difference too; only restarting on {B, C} puts B first
+    order = _rank(games, wins=[10, 10, 10, 12], pf=[1600, 1500, 1600, 1700], pa=[1550, 1520, 1550, 1600],
+                  names=[0, 1, 2, 3])
+    assert order == [X, A, B, C]
+
+
+def test_three_way_tie_without_double_round_robin_uses_general_criteria():
+    A, B, C = range(3)
+    games = [(A, B, 90, 70), (B, A, 70, 90), (A, C, 80, 78), (B, C, 85, 80), (C, B, 81, 80)]
+    # A and C met once only: head-to-head does not apply, difference decides
+    order = _rank(games, wins=[10, 10, 10], pf=[1600, 1650, 1600], pa=[1590, 1550, 1560], names=[0, 1, 2])
+    assert order == [B, C, A]
+
+
+def test_four_way_tie_falls_back_to_lexsort_inside_the_subgroup():
+    A, B, C, D = range(4)
+    games = [
+        (A, B, 80, 70), (B, A, 70, 80), (A, C, 80, 70), (C, A, 70, 80), (A, D, 80, 70), (D, A, 70, 80),
+        # B, C and D each win one home game against each other by the same score
+        (B, C, 80, 70), (C, D, 80, 70), (D, B, 80, 70),
+        (C, B, 80, 70), (D, C, 80, 70), (B, D, 80, 70),
+    ]
+    # {B, C, D} are level on head-to-head wins, difference and points: the
+    # general criteria decide, sanctioned last even with the best difference,
+    # then overall difference (C) before the club name (B)
+    order = _rank(games, wins=[10, 10, 10, 10], pf=[1600, 1500, 1520, 1700], pa=[1500, 1500, 1500, 1400],
+                  names=[0, 1, 2, 3], sanctioned=[False, False, False, True])
+    assert order == [A, C, B, D]
+
+
+def test_four_way_tie_split_two_and_two():
+    A, B, C, D = range(4)
+    games = [
+        (A, C, 80, 70), (C, A, 70, 80), (A, D, 80, 70), (D, A, 70, 80),
+        (B, C, 80, 70), (C, B, 70, 80), (B, D, 80, 70), (D, B, 70, 80),
+        (A, B, 90, 70), (B, A, 75, 70),   # A and B split, A +15 between them
+        (C, D, 70, 71), (D, C, 90, 60),   # D wins both
+    ]
+    # Mini-table: A and B 5 wins, C 0, D 2; each pair is then resolved on its own games
+    order = _rank(games, wins=[10, 10, 10, 10], pf=[1500, 1600, 1600, 1500], pa=[1500, 1500, 1500, 1500],
+                  names=[3, 2, 1, 0])
+    assert order == [A, B, D, C]
@@ -0,0 +1,56 @@
+"""Live watcher replaying matchdays against a local stand-in of the games API."""
+import requests
+
+from standings import watch
+from standings.core import EUROLEAGUE
+from standings.http_cache import ResponseCache
+from standings.synthetic import synthetic_payload
+from standings.watch import Watcher
+
+TEMPLATE = "/v2/competitions/{code}/seasons/{code}{season}/games"
+PATH = TEMPLATE.format(code="E", season=2025)
+
+
+def _watcher(fake_api, directory):
+    competition = EUROLEAGUE.with_api_url(fake_api.base + TEMPLATE)
+    cache = ResponseCache(directory / "cache", ttl=0, session=requests.Session())
+    return Watcher([competition], out_dir=directory / "out", cache=cache)
+
+
+def _export(fake_api, directory):
+    _watcher(fake_api, directory).poll()
+    return (directory / "out" / EUROLEAGUE.filename).read_bytes()
+
+
+def test_replays_matchdays(fake_api, tmp_path):
+    watcher = _watcher(fake_api, tmp_path / "live")
+    export = tmp_path / "live" / "out" / EUROLEAGUE.filename
+
+    fake_api.set_json(PATH, synthetic_payload(n_teams=10, played=0.5, seed=7))
+    assert watcher.poll() == [export]
+    assert watcher.poll() == []
+    assert fake_api.statuses(PATH)[-1] == 304
+
+    fake_api.set_json(PATH, synthetic_payload(n_teams=10, played=0.6, seed=7))
+    assert watcher.poll() == [export]
+    assert watcher.interval == watcher.fast
+    assert export.read_bytes() == _export(fake_api, tmp_path / "fresh")
+
+
+def test_failed_write_is_retried(fake_api, tmp_path, monkeypatch):
+    watcher = _watcher(fake_api, tmp_path / "live")
+    export = tmp_path / "live" / "out" / EUROLEAGUE.filename
+    fake_api.set_json(PATH, synthetic_payload(n_teams=10, played=0.5, seed=7))
+    watcher.poll()
+
+    fake_api.set_json(PATH, synthetic_payload(n_teams=10, played=0.6, seed=7))
+    atomic_write = watch.atomic_write
+
+    def full_disk(path, data):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(watch, "atomic_write", full_disk)
+    assert watcher.poll() == []
+    monkeypatch.setattr(watch, "atomic_write", atomic_write)
+    assert watcher.poll() == [export]
+    assert export.read_bytes() == _export(fake_api, tmp_path / "fresh")
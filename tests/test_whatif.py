@@ -0,0 +1,55 @@
+"""Batched what-if scenarios against a full recompute."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from standings.core import resolve_tiebreakers_with_bylaws
+from standings.parse import parse_items
+from standings.season import Season
+from standings.synthetic import synthetic_payload
+from standings.whatif import WhatIf
+
+COLUMNS = ["Team", "W", "L", "PF", "PA", "Games", "Sanctioned", "Diff", "Total", "ClubName"]
+
+
+def _season():
+    parsed = parse_items(synthetic_payload(n_teams=10, played=0.6, tie_rate=0.6, forfeits=1, seed=5)["data"],
+                         detect_sanctioned=True)
+    return Season.from_parsed(parsed, "E", 2025)
+
+
+def _recompute(season, overrides):
+    df = season.to_dataframe()
+    rows = {int(code): k for k, code in enumerate(season.game_code)}
+    for game, hs, rs in overrides:
+        k = rows[game]
+        if hs == rs:
+            df.loc[k, ["HomeWin", "RoadWin", "HomeScore", "RoadScore", "PlusMinus"]] = np.nan
+        else:
+            df.loc[k, ["HomeWin", "RoadWin", "HomeScore", "RoadScore", "PlusMinus"]] = (
+                float(hs > rs), float(hs < rs), hs, rs, hs - rs)
+    sanctioned = [team for team, flag in zip(season.teams, season.sanctioned) if flag]
+    return resolve_tiebreakers_with_bylaws(df, sanctioned)[COLUMNS]
+
+
+def test_rank_matches_full_recompute():
+    season = _season()
+    played = [int(code) for code in season.game_code[season.played]]
+    unplayed = [int(code) for code in season.game_code[~season.played]]
+    scenarios = [
+        [],
+        [(played[0], 60, 90)],
+        [(code, 80, 70 + i) for i, code in enumerate(unplayed)],
+        # Clear a result, and override the same game twice: the last override wins
+        [(unplayed[0], 70, 80), (played[2], 0, 0), (unplayed[0], 95, 60)],
+    ]
+
+    results = WhatIf(season).rank(scenarios, batch_size=3)
+    assert len(results) == len(scenarios)
+    for k, overrides in enumerate(scenarios):
+        pd.testing.assert_frame_equal(results.table(k)[COLUMNS], _recompute(season, overrides), check_dtype=False)
+
+
+def test_unknown_game_code_raises_key_error():
+    with pytest.raises(KeyError):
+        WhatIf(_season()).rank([[(999_999, 80, 70)]])